@@ -34,6 +34,13 @@ logger.remove()
 logger.add(sys.stderr, level="INFO")
 logger.add("streamlit_app.log", rotation="10 MB", level="DEBUG")
 
+# Use uvloop for the interview event loops when it is available
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    logger.info("uvloop not installed, using the default asyncio event loop")
+
 # Import the necessary modules
 try:
     from domains.handler import (
@@ -44,6 +51,10 @@ try:
         export_session_data
     )
     from domains.recruitment.scenario_manager import get_all_scenarios, get_scenario_by_id
+    from domains.settings import config_settings
+    from domains.utils import initialize_llm_cache
+    config_settings.validate_vector_db_config()
+    initialize_llm_cache()
 except ImportError as e:
     st.error(f"Failed to import required modules: {e}")
     st.stop()
@@ -203,13 +214,10 @@ def display_evaluation_report(report):
     # Display detailed evaluations
     st.markdown('<div class="sub-header">Detailed Evaluations</div>', unsafe_allow_html=True)
     
+    question_text_by_id = {q.get("id"): q.get("question", "Unknown question") for q in scenario.get("questions", [])}
     for question_id, evaluation in detailed_evaluations.items():
         # Find the question text from the scenario
-        question_text = "Unknown question"
-        for q in scenario.get("questions", []):
-            if q.get("id") == question_id:
-                question_text = q.get("question", "Unknown question")
-                break
+        question_text = question_text_by_id.get(question_id, "Unknown question")
         
         # Create an expander for each question
         with st.expander(f"Question: {question_text}"):
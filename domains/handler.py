@@ -3,11 +3,16 @@ from loguru import logger
 import asyncio
 import json
 import os
-from datetime import datetime
+import time
+import itertools
+from pathlib import Path
 import concurrent.futures
 import threading
+from contextvars import ContextVar
 from functools import partial
 
+import orjson
+
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 
 from domains.recruitment.scenario_manager import (
@@ -36,7 +41,7 @@ from domains.recruitment.storage import (
     get_all_sessions,
     search_sessions,
     get_complete_session_data,
-    export_session_to_json
+    export_session_to_ndjson
 )
 from domains.settings import config_settings
 
@@ -46,19 +51,39 @@ thread_local = threading.local()
 # Semaphore for limiting concurrent interviews
 interview_semaphore = asyncio.Semaphore(config_settings.CONCURRENCY_LIMIT)
 
+# Session being driven in the current context, for callers that send it many responses in a row
+SESSION_CV: ContextVar[str] = ContextVar("session_id")
+
+# System message shared by every reconstructed conversation history
+_SYSTEM_MESSAGE = SystemMessage(content="You are an HR interviewer conducting a technical assessment interview.")
+
 # Initialize exports directory
 def initialize_handler():
     """Initialize the handler."""
-    # Create exports directory if it doesn't exist
+    # The exports directory is created lazily on the first export
     base_dir = os.path.dirname(os.path.dirname(__file__))
     exports_dir = os.path.join(base_dir, "exports")
-    os.makedirs(exports_dir, exist_ok=True)
     
     logger.info("Initialized HR Automation Handler")
     return exports_dir
 
 # Global variable to store exports directory
 exports_dir = initialize_handler()
+_exports_dir_ready = False
+
+def _ensure_exports_dir() -> None:
+    """Create the exports directory once, before the first export."""
+    global _exports_dir_ready
+    if not _exports_dir_ready:
+        os.makedirs(exports_dir, exist_ok=True)
+        _exports_dir_ready = True
+
+# Counter that keeps export filenames unique within the same second
+_export_counter = itertools.count()
+
+def _export_suffix() -> str:
+    """Return a unique suffix for export filenames."""
+    return f"{int(time.time())}_{next(_export_counter)}"
 
 async def start_interview_session(
     scenario_id: Optional[str] = None, 
@@ -151,16 +176,12 @@ async def process_response(
             conversation_history = []
             
             # Add system message
-            conversation_history.append(SystemMessage(content="You are an HR interviewer conducting a technical assessment interview."))
+            conversation_history.append(_SYSTEM_MESSAGE)
             
             # Add previous Q&A pairs
+            question_text_by_id = {q["id"]: q["question"] for q in scenario["questions"]}
             for resp in responses:
-                # Find the question
-                question_text = ""
-                for q in scenario["questions"]:
-                    if q["id"] == resp["question_id"]:
-                        question_text = q["question"]
-                        break
+                question_text = question_text_by_id.get(resp["question_id"], "")
                 
                 conversation_history.append(AIMessage(content=question_text))
                 conversation_history.append(HumanMessage(content=resp["response_text"]))
@@ -168,6 +189,7 @@ async def process_response(
             # Get current question
             current_question = None
             questions_asked = [resp["question_id"] for resp in responses]
+            questions_asked_set = set(questions_asked)
             
             if not questions_asked:
                 # First question
@@ -175,7 +197,7 @@ async def process_response(
             else:
                 # Find the next question
                 for q in scenario["questions"]:
-                    if q["id"] not in questions_asked:
+                    if q["id"] not in questions_asked_set:
                         current_question = q
                         break
             
@@ -210,13 +232,13 @@ async def process_response(
             )
             
             # Check if interview is complete
-            if updated_session.get("interview_complete", False):
-                return await complete_interview(session_id, scenario, responses + [{"question_id": current_question["id"], "response_text": response}])
-            
-            # Check if all questions have been asked
             questions_asked = updated_session.get("questions_asked", [])
             all_questions = scenario.get("questions", [])
             
+            if _is_interview_complete(updated_session, scenario):
+                logger.info(f"All questions have been asked ({len(questions_asked)}/{len(all_questions)}), marking interview as complete")
+                return await complete_interview(session_id, scenario, responses + [{"question_id": current_question["id"], "response_text": response}])
+            
             # Return updated session information
             session_info = {
                 "session_id": session_id,
@@ -236,11 +258,6 @@ async def process_response(
                 ]
             }
             
-            # If all questions have been asked or the last question has been answered, mark as complete
-            if len(questions_asked) >= len(all_questions) or updated_session.get("interview_complete", False):
-                logger.info(f"All questions have been asked ({len(questions_asked)}/{len(all_questions)}), marking interview as complete")
-                return await complete_interview(session_id, scenario, responses + [{"question_id": current_question["id"], "response_text": response}])
-            
             logger.info(f"Interview not complete yet, {len(questions_asked)}/{len(all_questions)} questions asked")
             
             logger.info(f"Processed response for session {session_id}")
@@ -249,6 +266,37 @@ async def process_response(
             logger.error(f"Error processing response: {str(e)}")
             return {"error": f"Failed to process response: {str(e)}"}
 
+async def process_current_response(response: str) -> Dict[str, Any]:
+    """
+    Process a candidate's response in the session set in SESSION_CV.
+    
+    Args:
+        response: The candidate's response
+        
+    Returns:
+        Dictionary with updated session information.
+    """
+    session_id = SESSION_CV.get(None)
+    if session_id is None:
+        logger.error("No interview session set for the current context")
+        return {"error": "No interview session set for the current context"}
+    return await process_response(session_id, response)
+
+def _is_interview_complete(session: Dict[str, Any], scenario: Dict[str, Any]) -> bool:
+    """
+    Check whether an interview session has finished.
+    
+    Args:
+        session: The session returned by the conversation engine
+        scenario: The scenario data
+        
+    Returns:
+        True if the engine marked the interview complete or every question has been asked.
+    """
+    if session.get("interview_complete", False):
+        return True
+    return len(session.get("questions_asked", [])) >= len(scenario.get("questions", []))
+
 async def complete_interview(
     session_id: str, 
     scenario: Dict[str, Any], 
@@ -311,14 +359,14 @@ async def complete_interview(
         
         # Export report to JSON
         global exports_dir
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        _ensure_exports_dir()
         export_path = os.path.join(
             exports_dir, 
-            f"report_{session_id}_{timestamp}.json"
+            f"report_{session_id}_{_export_suffix()}.json"
         )
         
-        with open(export_path, "w") as f:
-            json.dump(report, f, indent=2)
+        report_bytes = orjson.dumps(report, option=orjson.OPT_INDENT_2)
+        await asyncio.to_thread(Path(export_path).write_bytes, report_bytes)
         
         logger.info(f"Completed interview session {session_id} and generated report")
         
@@ -405,7 +453,7 @@ def search_sessions_by_query(query: str, limit: int = 100) -> Dict[str, Any]:
 
 def export_session_data(session_id: str) -> Dict[str, Any]:
     """
-    Export a session to a JSON file.
+    Export a session to a newline-delimited JSON file, one record per line.
     
     Args:
         session_id: The session ID
@@ -415,13 +463,13 @@ def export_session_data(session_id: str) -> Dict[str, Any]:
     """
     try:
         global exports_dir
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        _ensure_exports_dir()
         export_path = os.path.join(
             exports_dir, 
-            f"session_{session_id}_{timestamp}.json"
+            f"session_{session_id}_{_export_suffix()}.ndjson"
         )
         
-        path = export_session_to_json(session_id, export_path)
+        path = export_session_to_ndjson(session_id, export_path)
         
         return {
             "session_id": session_id,
@@ -454,13 +502,21 @@ async def run_batch_interviews(
         logger.error("Mismatch in input list lengths")
         return [{"error": "Mismatch in input list lengths"}]
     
-    # Create tasks for each interview
-    tasks = []
+    # Create tasks for each interview, remembering each task's input position
+    results = [None] * len(scenario_ids)
+    task_to_idx = {}
     for i, (scenario_id, responses, metadata) in enumerate(zip(scenario_ids, responses_list, metadata_list)):
-        tasks.append(run_single_interview(scenario_id, responses, metadata))
+        task = asyncio.create_task(run_single_interview(scenario_id, responses, metadata))
+        task_to_idx[task] = i
     
-    # Run interviews in parallel with concurrency limit
-    results = await asyncio.gather(*tasks)
+    # Collect interviews as they finish while preserving input order
+    pending = set(task_to_idx)
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            idx = task_to_idx[task]
+            results[idx] = task.result()
+            logger.info(f"Batch interview {idx + 1}/{len(results)} finished")
     
     return results
 
@@ -0,0 +1,56 @@
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Callers always pass the same dtypes (int8 evaluation scores, float32 summary ratings),
+# so numba compiles a single specialization of each kernel and caches it on disk.
+
+
+def _mean_scores_numpy(scores: np.ndarray) -> np.ndarray:
+    """Column means of a non-empty (evaluations x criteria) int8 score array."""
+    return scores.mean(axis=0)
+
+
+def _nanmean_scores_numpy(scores: np.ndarray) -> np.ndarray:
+    """Column means of a (summaries x ratings) float32 array, ignoring NaN; NaN for columns with no rating."""
+    rated = ~np.isnan(scores)
+    counts = rated.sum(axis=0)
+    totals = np.where(rated, scores, 0).sum(axis=0)
+    means = np.full(scores.shape[1], np.nan, dtype=np.float32)
+    np.divide(totals, counts, out=means, where=counts > 0)
+    return means
+
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def mean_scores(scores):
+        """Column means of a non-empty (evaluations x criteria) int8 score array."""
+        rows, cols = scores.shape
+        totals = np.zeros(cols)
+        for i in range(rows):
+            for j in range(cols):
+                totals[j] += scores[i, j]
+        return totals / rows
+
+    # No fastmath here: it lets numba assume there are no NaNs, which breaks the isnan checks
+    @njit(cache=True)
+    def nanmean_scores(scores):
+        """Column means of a (summaries x ratings) float32 array, ignoring NaN; NaN for columns with no rating."""
+        rows, cols = scores.shape
+        means = np.empty(cols, np.float32)
+        for j in range(cols):
+            total = 0.0
+            count = 0
+            for i in range(rows):
+                value = scores[i, j]
+                if not np.isnan(value):
+                    total += value
+                    count += 1
+            means[j] = total / count if count else np.nan
+        return means
+else:
+    mean_scores = _mean_scores_numpy
+    nanmean_scores = _nanmean_scores_numpy
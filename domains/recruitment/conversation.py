@@ -1,10 +1,12 @@
+import asyncio
+from collections import deque
 from typing import List, Dict, Any, Optional, Tuple
 from loguru import logger
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
-from langchain.output_parsers import PydanticOutputParser
 
-from domains.utils import get_chat_llm
+from domains.utils import get_chat_llm, get_structured_llm
+from domains.settings import config_settings
 from domains.recruitment.prompts import (
     ClarificationResponse,
     ResponseAnalysis,
@@ -18,14 +20,97 @@ from domains.recruitment.scenario_manager import (
     select_random_scenario
 )
 
+# Shared chat model client. It holds no per-session state: everything an
+# interview needs is threaded through the session dict, so concurrent
+# interviews can share it without pooling engines per session.
 _llm = None
 
+# Chains built once when the engine is initialized and shared by all calls
+_clarification_chain = None
+_analysis_chain = None
+_next_question_chain = None
+
 def initialize_conversation_engine():
     """Initialize the conversation engine."""
-    global _llm
+    global _llm, _clarification_chain, _analysis_chain, _next_question_chain
     _llm = get_chat_llm()
+    
+    # Format instructions are only needed when the model has no native structured output
+    clarification_llm, native = get_structured_llm(_llm, ClarificationResponse)
+    _clarification_chain = initialize_clarification_prompt(include_format_instructions=not native) | clarification_llm
+    analysis_llm, native = get_structured_llm(_llm, ResponseAnalysis)
+    _analysis_chain = initialize_response_analysis_prompt(include_format_instructions=not native) | analysis_llm
+    _next_question_chain = initialize_next_question_prompt() | _llm | StrOutputParser()
     logger.info("Conversation engine initialized")
 
+def _format_history_line(message) -> str:
+    """Render a conversation message as a line of the transcript used in prompts."""
+    speaker = "Interviewer" if isinstance(message, AIMessage) else "Candidate"
+    return f"{speaker}: {message.content}"
+
+def _get_recent_history(session: Dict[str, Any]) -> deque:
+    """
+    Get the rendered lines of the most recent messages, building them from the message
+    list only when the session does not carry them yet (e.g. a session rebuilt from storage).
+    
+    Interviewer lines that fall out of the window are kept in session["_earlier_questions"]
+    so the prompt still knows which topics were covered.
+    
+    Args:
+        session: The current interview session.
+        
+    Returns:
+        Bounded deque of transcript lines, oldest first.
+    """
+    if "_history_lines" not in session:
+        lines = [
+            (isinstance(msg, AIMessage), _format_history_line(msg))
+            for msg in session.get("conversation_history", [])
+            if not isinstance(msg, SystemMessage)
+        ]
+        window = config_settings.NEXT_QUESTION_HISTORY_MESSAGES
+        split = max(len(lines) - window, 0)
+        session["_earlier_questions"] = [line for is_ai, line in lines[:split] if is_ai]
+        session["_history_lines"] = deque((line for _, line in lines[split:]), maxlen=window)
+    return session["_history_lines"]
+
+def _render_history(session: Dict[str, Any]) -> str:
+    """Render the conversation for the next-question prompt: earlier questions plus the recent transcript."""
+    recent = "\n".join(_get_recent_history(session))
+    earlier = session.get("_earlier_questions")
+    if not earlier:
+        return recent
+    return "Earlier in the interview:\n" + "\n".join(earlier) + "\n\nMost recent exchange:\n" + recent
+
+def _get_remaining_question_ids(session: Dict[str, Any]) -> set:
+    """
+    Get the IDs of the scenario questions that have not been asked yet.
+    
+    Args:
+        session: The current interview session.
+        
+    Returns:
+        Set of question IDs still available.
+    """
+    if "_remaining_q_ids" not in session:
+        session["_remaining_q_ids"] = (
+            {q["id"] for q in session["scenario"]["questions"]} - set(session["questions_asked"])
+        )
+    return session["_remaining_q_ids"]
+
+def _append_to_history(session: Dict[str, Any], message) -> None:
+    """Append a message to the conversation history and keep the recent transcript in sync."""
+    # Build the transcript from the existing history first, otherwise a rebuilt session
+    # (see handler.process_response) would pick the new message up twice
+    lines = _get_recent_history(session)
+    session["conversation_history"].append(message)
+    if isinstance(message, SystemMessage):
+        return
+    if len(lines) == lines.maxlen and lines[0].startswith("Interviewer: "):
+        # The oldest line is about to drop out of the window; keep the question it asked
+        session["_earlier_questions"].append(lines[0])
+    lines.append(_format_history_line(message))
+
 def start_interview(scenario_id: Optional[str] = None) -> Dict[str, Any]:
     try:
         # Select scenario
@@ -47,13 +132,14 @@ def start_interview(scenario_id: Optional[str] = None) -> Dict[str, Any]:
             "current_question_index": 0,
             "questions_asked": [],
             "conversation_history": [],
-            "evaluation": {}
+            "evaluation": {},
+            "_history_lines": deque(maxlen=config_settings.NEXT_QUESTION_HISTORY_MESSAGES),
+            "_earlier_questions": [],
+            "_remaining_q_ids": {q["id"] for q in scenario.get("questions", [])}
         }
         
         # Add system message to conversation history
-        session["conversation_history"].append(
-            SystemMessage(content=SYSTEM_PROMPT)
-        )
+        _append_to_history(session, SystemMessage(content=SYSTEM_PROMPT))
         
         # Get first question
         try:
@@ -64,10 +150,11 @@ def start_interview(scenario_id: Optional[str] = None) -> Dict[str, Any]:
         
         session["current_question"] = first_question
         session["questions_asked"].append(first_question["id"])
+        session["_remaining_q_ids"].discard(first_question["id"])
         
         # Add first question to conversation history
-        session["conversation_history"].append(
-            AIMessage(content=f"Let's begin the interview. {first_question['question']}")
+        _append_to_history(
+            session, AIMessage(content=f"Let's begin the interview. {first_question['question']}")
         )
         
         logger.info(f"Started interview with scenario: {scenario.get('id', 'unknown')}")
@@ -103,63 +190,64 @@ async def process_response(session: Dict[str, Any], response: str) -> Dict[str,
             raise ValueError("Invalid session format: missing current_question")
         
         # Add response to conversation history
-        session["conversation_history"].append(
-            HumanMessage(content=response)
-        )
+        _append_to_history(session, HumanMessage(content=response))
         
-        # Check if clarification is needed
+        # Check for clarification first, so no other LLM call is spent on a turn that needs one
+        question = session["current_question"]["question"]
+        logger.info("Checking if clarification is needed")
         try:
-            logger.info("Checking if clarification is needed for response")
-            clarification_prompt = initialize_clarification_prompt()
-            clarification_parser = PydanticOutputParser(pydantic_object=ClarificationResponse)
-            clarification_chain = clarification_prompt | _llm | clarification_parser
-            
-            clarification_result = await clarification_chain.ainvoke({
-                "question": session["current_question"]["question"],
-                "response": response
-            })
-            
+            clarification_result = await check_clarification(question, response)
+        except Exception as e:
+            logger.error(f"Error in clarification check: {str(e)}")
+            # Continue with response analysis even if clarification check fails
+        else:
             if clarification_result.needs_clarification:
                 # Add clarification question to conversation history
-                session["conversation_history"].append(
-                    AIMessage(content=clarification_result.clarification_question)
+                _append_to_history(
+                    session, AIMessage(content=clarification_result.clarification_question)
                 )
                 session["awaiting_clarification"] = True
                 logger.info("Clarification needed, returning with clarification question")
                 return session
-        except Exception as e:
-            logger.error(f"Error in clarification check: {str(e)}")
-            # Continue with response analysis even if clarification check fails
         
-        # If no clarification needed or clarification was provided, analyze response
+        # If no clarification needed or clarification was provided, store the analysis
         session["awaiting_clarification"] = False
         
-        # Analyze response
+        # Determine if interview should continue
+        interview_complete = False
         try:
-            logger.info("Analyzing candidate response")
-            response_analysis_prompt = initialize_response_analysis_prompt()
-            response_analysis_parser = PydanticOutputParser(pydantic_object=ResponseAnalysis)
-            analysis_chain = response_analysis_prompt | _llm | response_analysis_parser
-            
-            analysis_result = await analysis_chain.ainvoke({
-                "question": session["current_question"]["question"],
-                "response": response
-            })
+            questions_asked_count = len(session["questions_asked"])
+            total_questions_count = len(session["scenario"]["questions"])
+            logger.info(f"Checking if interview is complete: {questions_asked_count} questions asked out of {total_questions_count} total questions")
+            logger.debug(f"Questions asked: {session['questions_asked']}")
             
-            # Store analysis
-            question_id = session["current_question"]["id"]
-            session["evaluation"][question_id] = {
-                "question": session["current_question"]["question"],
-                "response": response,
-                "analysis": analysis_result.dict()
-            }
-            logger.info(f"Response analysis completed for question {question_id}")
-        except Exception as e:
-            logger.error(f"Error in response analysis: {str(e)}")
+            if questions_asked_count >= total_questions_count:
+                interview_complete = True
+            else:
+                logger.info(f"Interview not complete yet, {total_questions_count - questions_asked_count} questions remaining")
+        except KeyError as e:
+            logger.error(f"Error checking if interview is complete: {str(e)}")
+            logger.error(f"Session keys: {list(session.keys())}")
+            # Assume interview should continue if we can't determine if it's complete
+        
+        # Analyze the response, selecting the next question concurrently when one is still needed
+        logger.info("Analyzing candidate response")
+        next_question_result = None
+        if interview_complete:
+            analysis_result, = await asyncio.gather(analyze_response(question, response), return_exceptions=True)
+        else:
+            analysis_result, next_question_result = await asyncio.gather(
+                analyze_response(question, response),
+                select_next_question(session),
+                return_exceptions=True
+            )
+        
+        question_id = session["current_question"]["id"]
+        if isinstance(analysis_result, Exception):
+            logger.error(f"Error in response analysis: {str(analysis_result)}")
             # Create a default analysis if the analysis fails
-            question_id = session["current_question"]["id"]
             session["evaluation"][question_id] = {
-                "question": session["current_question"]["question"],
+                "question": question,
                 "response": response,
                 "analysis": {
                     "relevance_score": 5,
@@ -170,47 +258,44 @@ async def process_response(session: Dict[str, Any], response: str) -> Dict[str,
                     "reasoning": "Analysis failed due to an error."
                 }
             }
+        else:
+            session["evaluation"][question_id] = {
+                "question": question,
+                "response": response,
+                "analysis": analysis_result.model_dump()
+            }
+            logger.info(f"Response analysis completed for question {question_id}")
         
-        # Determine if interview should continue
-        try:
-            questions_asked_count = len(session["questions_asked"])
-            total_questions_count = len(session["scenario"]["questions"])
-            logger.info(f"Checking if interview is complete: {questions_asked_count} questions asked out of {total_questions_count} total questions")
-            logger.debug(f"Questions asked: {session['questions_asked']}")
-            
-            if questions_asked_count >= total_questions_count:
-                # All questions have been asked
-                logger.info("All questions have been asked, marking interview as complete")
-                session["interview_complete"] = True
-                session["conversation_history"].append(
-                    AIMessage(content="Thank you for completing this technical interview. We'll now evaluate your responses.")
-                )
-                logger.info("Interview completed, all questions asked")
-                return session
-            else:
-                logger.info(f"Interview not complete yet, {total_questions_count - questions_asked_count} questions remaining")
-        except KeyError as e:
-            logger.error(f"Error checking if interview is complete: {str(e)}")
-            logger.error(f"Session keys: {list(session.keys())}")
-            # Assume interview should continue if we can't determine if it's complete
+        if interview_complete:
+            # All questions have been asked
+            logger.info("All questions have been asked, marking interview as complete")
+            session["interview_complete"] = True
+            _append_to_history(
+                session,
+                AIMessage(content="Thank you for completing this technical interview. We'll now evaluate your responses.")
+            )
+            logger.info("Interview completed, all questions asked")
+            return session
         
         # Select next question
         try:
             logger.info("Selecting next question")
-            next_question = await select_next_question(session)
+            if isinstance(next_question_result, Exception):
+                raise next_question_result
+            next_question = next_question_result
             if next_question:
                 session["current_question"] = next_question
                 session["questions_asked"].append(next_question["id"])
+                _get_remaining_question_ids(session).discard(next_question["id"])
                 
                 # Add next question to conversation history
-                session["conversation_history"].append(
-                    AIMessage(content=next_question["question"])
-                )
+                _append_to_history(session, AIMessage(content=next_question["question"]))
                 logger.info(f"Selected next question: {next_question['id']}")
             else:
                 # No more questions available
                 session["interview_complete"] = True
-                session["conversation_history"].append(
+                _append_to_history(
+                    session,
                     AIMessage(content="Thank you for completing this technical interview. We'll now evaluate your responses.")
                 )
                 logger.info("Interview completed, no more questions available")
@@ -218,7 +303,8 @@ async def process_response(session: Dict[str, Any], response: str) -> Dict[str,
             logger.error(f"Error selecting next question: {str(e)}")
             # Mark interview as complete if we can't select the next question
             session["interview_complete"] = True
-            session["conversation_history"].append(
+            _append_to_history(
+                session,
                 AIMessage(content="Thank you for completing this technical interview. We'll now evaluate your responses.")
             )
             logger.info("Interview completed due to error in selecting next question")
@@ -229,6 +315,38 @@ async def process_response(session: Dict[str, Any], response: str) -> Dict[str,
         # Return the session as is if there's an error, to avoid losing data
         return session
 
+async def check_clarification(question: str, response: str) -> ClarificationResponse:
+    """
+    Check whether a candidate's response needs a clarifying follow-up question.
+    
+    Args:
+        question: The question asked.
+        response: The candidate's response.
+        
+    Returns:
+        The clarification decision.
+    """
+    return await _clarification_chain.ainvoke({
+        "question": question,
+        "response": response
+    })
+
+async def analyze_response(question: str, response: str) -> ResponseAnalysis:
+    """
+    Analyze a candidate's response to a question.
+    
+    Args:
+        question: The question asked.
+        response: The candidate's response.
+        
+    Returns:
+        The response analysis.
+    """
+    return await _analysis_chain.ainvoke({
+        "question": question,
+        "response": response
+    })
+
 async def select_next_question(session: Dict[str, Any]) -> Dict[str, str]:
     """
     Select the next question to ask based on the conversation history.
@@ -256,18 +374,15 @@ async def select_next_question(session: Dict[str, Any]) -> Dict[str, str]:
         
         try:
             scenario = session["scenario"]
-            questions_asked = session["questions_asked"]
             
             # Validate scenario
             if "questions" not in scenario:
                 logger.error("Scenario missing questions field")
                 raise ValueError("Invalid scenario format: missing questions field")
             
-            # Get available questions (those not yet asked)
-            available_questions = []
-            for q in scenario["questions"]:
-                if q["id"] not in questions_asked:
-                    available_questions.append(q)
+            # Get available questions (those not yet asked), in scenario order
+            remaining_ids = _get_remaining_question_ids(session)
+            available_questions = [q for q in scenario["questions"] if q["id"] in remaining_ids]
             
             if not available_questions:
                 # No more questions available
@@ -292,19 +407,12 @@ async def select_next_question(session: Dict[str, Any]) -> Dict[str, str]:
                 f"ID: {q['id']}, Question: {q['question']}" for q in available_questions
             ])
             
-            # Format conversation history for the prompt
-            conversation_history_text = "\n".join([
-                f"{'Interviewer' if isinstance(msg, AIMessage) else 'Candidate'}: {msg.content}"
-                for msg in session["conversation_history"]
-                if not isinstance(msg, SystemMessage)
-            ])
+            # Only the most recent messages are sent in full, so the prompt does not grow with the interview
+            conversation_history_text = _render_history(session)
             
             # Use LLM to select next question
             logger.info("Using LLM to select next question")
-            next_question_prompt = initialize_next_question_prompt()
-            next_question_chain = next_question_prompt | _llm | StrOutputParser()
-            
-            next_question_id = await next_question_chain.ainvoke({
+            next_question_id = await _next_question_chain.ainvoke({
                 "scenario_title": scenario.get("title", "Unknown Scenario"),
                 "scenario_description": scenario.get("description", "No description available"),
                 "available_questions": available_questions_text,
@@ -312,14 +420,14 @@ async def select_next_question(session: Dict[str, Any]) -> Dict[str, str]:
             })
             
             # Clean up the response to get just the ID
-            next_question_id = next_question_id.strip().replace("ID: ", "").split(",")[0].strip()
+            next_question_id = next_question_id.strip().removeprefix("ID:").split(",", 1)[0].strip()
             logger.info(f"LLM selected question ID: {next_question_id}")
             
             # Find the question with the selected ID
-            for q in available_questions:
-                if q["id"] == next_question_id:
-                    logger.info(f"Found matching question for ID {next_question_id}")
-                    return q
+            question = {q["id"]: q for q in available_questions}.get(next_question_id)
+            if question is not None:
+                logger.info(f"Found matching question for ID {next_question_id}")
+                return question
             
             # If the selected ID wasn't found, return the first available question
             logger.warning(f"Selected question ID {next_question_id} not found, using first available question")
@@ -1,16 +1,22 @@
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Tuple, Union
 from loguru import logger
+import asyncio
 import json
+from dataclasses import dataclass
 from datetime import datetime
 
+import numpy as np
+
 from langchain_core.output_parsers import StrOutputParser
-from langchain.output_parsers import PydanticOutputParser
 from pydantic import BaseModel, Field
 
-from domains.utils import get_chat_llm
+from domains.utils import get_chat_llm, get_embeddings, get_structured_llm
+from domains.settings import config_settings
 from domains.stategraph import InterviewAnalysisState
+from domains.recruitment._kernels import mean_scores
 from domains.recruitment.prompts import (
     initialize_detailed_evaluation_prompt,
+    initialize_batch_evaluation_prompt,
     initialize_overall_evaluation_prompt
 )
 
@@ -28,6 +34,10 @@ class DetailedEvaluation(BaseModel):
     strengths: List[str] = Field(description="Key strengths of the response")
     weaknesses: List[str] = Field(description="Areas for improvement in the response")
 
+class BatchEvaluation(BaseModel):
+    """Detailed evaluations of several responses produced in a single call."""
+    evaluations: List[DetailedEvaluation] = Field(description="One detailed evaluation per response, in the order the responses were given")
+
 class OverallEvaluation(BaseModel):
     """Overall evaluation of the entire interview."""
     technical_skills_score: int = Field(description="Overall technical skills demonstrated (1-10)")
@@ -42,13 +52,115 @@ class OverallEvaluation(BaseModel):
 
 # Global variables
 _llm = None
+_embeddings = None
 
-def initialize_evaluation_system():
-    """Initialize the evaluation system."""
-    global _llm
+# Chains built once when the system is initialized and shared by all calls
+_detailed_eval_chain = None
+_batch_eval_chain = None
+_overall_eval_chain = None
+
+# Semantic cache of previous evaluations, keyed by the exact question text. Only responses
+# to the same question are compared, so an evaluation is never reused for another question.
+# Oldest questions are evicted first once the cache is full.
+_cache_threshold = config_settings.EVALUATION_CACHE_THRESHOLD
+_CACHE_QUESTIONS = 256
+_CACHE_INITIAL_ROWS = 8
+
+@dataclass(slots=True)
+class _QuestionCache:
+    """Evaluations of responses to one question, with the unit-normalised response embeddings stacked as matrix rows."""
+    vectors: np.ndarray
+    evaluations: List[DetailedEvaluation]
+    next_row: int = 0
+    
+    def lookup(self, vector: np.ndarray) -> Optional[DetailedEvaluation]:
+        """Return the cached evaluation whose response is most similar to the vector if it meets the threshold."""
+        similarities = self.vectors[:len(self.evaluations)] @ vector
+        best = int(similarities.argmax())
+        if similarities[best] >= _cache_threshold:
+            logger.info(f"Reusing cached evaluation (similarity {similarities[best]:.3f})")
+            return self.evaluations[best]
+        return None
+    
+    def insert(self, vector: np.ndarray, evaluation: DetailedEvaluation) -> None:
+        """Add a row, growing the matrix up to EVALUATION_CACHE_SIZE rows and then overwriting the oldest row."""
+        rows = len(self.evaluations)
+        capacity = len(self.vectors)
+        if rows == capacity and capacity < config_settings.EVALUATION_CACHE_SIZE:
+            grown = np.empty((min(capacity * 2, config_settings.EVALUATION_CACHE_SIZE), self.vectors.shape[1]), dtype=np.float32)
+            grown[:capacity] = self.vectors
+            self.vectors = grown
+        if rows < len(self.vectors):
+            self.vectors[rows] = vector
+            self.evaluations.append(evaluation)
+        else:
+            self.vectors[self.next_row] = vector
+            self.evaluations[self.next_row] = evaluation
+            self.next_row = (self.next_row + 1) % len(self.vectors)
+
+_evaluation_cache: Dict[str, _QuestionCache] = {}
+
+def initialize_evaluation_system(cache_threshold: Optional[float] = None):
+    """
+    Initialize the evaluation system.
+    
+    Args:
+        cache_threshold: Minimum cosine similarity for a cached evaluation to be reused.
+            If None, uses EVALUATION_CACHE_THRESHOLD from the settings.
+    """
+    global _llm, _embeddings, _cache_threshold
+    global _detailed_eval_chain, _batch_eval_chain, _overall_eval_chain
     _llm = get_chat_llm()
+    
+    # Format instructions are only needed when the model has no native structured output
+    detailed_eval_llm, native = get_structured_llm(_llm, DetailedEvaluation)
+    _detailed_eval_chain = initialize_detailed_evaluation_prompt(include_format_instructions=not native) | detailed_eval_llm
+    batch_eval_llm, native = get_structured_llm(_llm, BatchEvaluation)
+    _batch_eval_chain = initialize_batch_evaluation_prompt(include_format_instructions=not native) | batch_eval_llm
+    overall_eval_llm, native = get_structured_llm(_llm, OverallEvaluation)
+    _overall_eval_chain = initialize_overall_evaluation_prompt(include_format_instructions=not native) | overall_eval_llm
+    
+    _embeddings = get_embeddings()
+    if cache_threshold is not None:
+        _cache_threshold = cache_threshold
     logger.info("Evaluation system initialized")
 
+async def _embed_for_cache(response: str) -> Optional[np.ndarray]:
+    """Embed a response for the evaluation cache, or return None if unavailable."""
+    if _embeddings is None:
+        return None
+    try:
+        vector = np.asarray(await _embeddings.aembed_query(response), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+    except Exception as e:
+        logger.warning(f"Could not embed response for evaluation cache: {str(e)}")
+        return None
+
+def _lookup_cached_evaluation(question: str, vector: Optional[np.ndarray]) -> Optional[DetailedEvaluation]:
+    """Return a cached evaluation of a near-identical response to the same question, if any."""
+    question_cache = _evaluation_cache.get(question)
+    if vector is None or question_cache is None:
+        return None
+    return question_cache.lookup(vector)
+
+def _cache_evaluation(question: str, vector: Optional[np.ndarray], evaluation: DetailedEvaluation) -> None:
+    """Store an evaluation in the cache of its question."""
+    if vector is None:
+        return
+    question_cache = _evaluation_cache.get(question)
+    if question_cache is None:
+        if len(_evaluation_cache) >= _CACHE_QUESTIONS:
+            _evaluation_cache.pop(next(iter(_evaluation_cache)))
+        question_cache = _evaluation_cache[question] = _QuestionCache(
+            vectors=np.empty(
+                (min(_CACHE_INITIAL_ROWS, config_settings.EVALUATION_CACHE_SIZE), vector.shape[0]),
+                dtype=np.float32
+            ),
+            evaluations=[]
+        )
+    question_cache.insert(vector, evaluation)
+
 async def evaluate_response(question: str, response: str) -> DetailedEvaluation:
     """
     Evaluate a single response to a question.
@@ -66,16 +178,22 @@ async def evaluate_response(question: str, response: str) -> DetailedEvaluation:
         initialize_evaluation_system()
     
     try:
-        # Create the evaluation chain
-        detailed_eval_prompt = initialize_detailed_evaluation_prompt()
-        detailed_eval_parser = PydanticOutputParser(pydantic_object=DetailedEvaluation)
-        eval_chain = detailed_eval_prompt | _llm | detailed_eval_parser
+        evaluation_input = {"question": question, "response": response}
+        if question in _evaluation_cache:
+            # Reuse the evaluation of a near-identical response to this question if one is cached
+            cache_vector = await _embed_for_cache(response)
+            cached_evaluation = _lookup_cached_evaluation(question, cache_vector)
+            if cached_evaluation is not None:
+                return cached_evaluation
+            evaluation = await _detailed_eval_chain.ainvoke(evaluation_input)
+        else:
+            # Nothing is cached for this question, so embed alongside the evaluation rather than before it
+            evaluation, cache_vector = await asyncio.gather(
+                _detailed_eval_chain.ainvoke(evaluation_input),
+                _embed_for_cache(response)
+            )
         
-        # Evaluate the response
-        evaluation = await eval_chain.ainvoke({
-            "question": question,
-            "response": response
-        })
+        _cache_evaluation(question, cache_vector, evaluation)
         
         logger.info(f"Evaluated response with overall score: {(evaluation.relevance_score + evaluation.completeness_score + evaluation.technical_accuracy_score) / 3:.1f}/10")
         return evaluation
@@ -83,11 +201,93 @@ async def evaluate_response(question: str, response: str) -> DetailedEvaluation:
         logger.error(f"Error evaluating response: {str(e)}")
         raise
 
+# Per-response summary included in the overall evaluation prompt
+_EVALUATION_SUMMARY_FORMAT = (
+    "- Relevance: {evaluation.relevance_score}/10\n"
+    "- Completeness: {evaluation.completeness_score}/10\n"
+    "- Clarity: {evaluation.clarity_score}/10\n"
+    "- Technical Accuracy: {evaluation.technical_accuracy_score}/10\n"
+    "- Professional Tone: {evaluation.professional_tone_score}/10\n"
+    "- Grammar: {evaluation.grammar_score}/10\n"
+    "- Vocabulary: {evaluation.vocabulary_score}/10\n"
+    "- Strengths: {strengths}\n"
+    "- Weaknesses: {weaknesses}\n"
+)
+
+def _format_evaluation_summary(evaluation: DetailedEvaluation) -> str:
+    """Format a detailed evaluation for the overall evaluation prompt."""
+    return _EVALUATION_SUMMARY_FORMAT.format(
+        evaluation=evaluation,
+        strengths=", ".join(evaluation.strengths),
+        weaknesses=", ".join(evaluation.weaknesses)
+    )
+
+async def batch_evaluate_responses(pairs: List[Tuple[str, str]]) -> List[DetailedEvaluation]:
+    """
+    Evaluate several responses with a single LLM call.
+    
+    Responses with a near-identical cached evaluation are not sent to the LLM.
+    
+    Args:
+        pairs: List of (question, response) pairs
+        
+    Returns:
+        Detailed evaluations in the same order as the pairs
+    """
+    # Ensure LLM is initialized
+    global _llm
+    if _llm is None:
+        initialize_evaluation_system()
+    
+    try:
+        # Reuse cached evaluations where possible and batch the rest. Only responses to
+        # questions with cached evaluations need their embedding before the lookup.
+        cache_vectors: List[Optional[np.ndarray]] = [None] * len(pairs)
+        lookup = [i for i, (question, _) in enumerate(pairs) if question in _evaluation_cache]
+        for i, vector in zip(lookup, await asyncio.gather(*(_embed_for_cache(pairs[i][1]) for i in lookup))):
+            cache_vectors[i] = vector
+        evaluations = [
+            _lookup_cached_evaluation(question, vector)
+            for (question, _), vector in zip(pairs, cache_vectors)
+        ]
+        pending = [i for i, evaluation in enumerate(evaluations) if evaluation is None]
+        if not pending:
+            return evaluations
+        
+        # Evaluate the pending responses, embedding the not yet embedded ones alongside
+        lookup_set = set(lookup)
+        embed_later = [i for i in pending if i not in lookup_set]
+        batch, *late_vectors = await asyncio.gather(
+            _batch_eval_chain.ainvoke({
+                "responses": "\n\n".join(
+                    f"RESPONSE {n}:\nQUESTION: {pairs[i][0]}\nCANDIDATE'S RESPONSE: {pairs[i][1]}"
+                    for n, i in enumerate(pending, start=1)
+                )
+            }),
+            *(_embed_for_cache(pairs[i][1]) for i in embed_later)
+        )
+        for i, vector in zip(embed_later, late_vectors):
+            cache_vectors[i] = vector
+        
+        if len(batch.evaluations) != len(pending):
+            raise ValueError(f"Expected {len(pending)} evaluations, got {len(batch.evaluations)}")
+        
+        for i, evaluation in zip(pending, batch.evaluations):
+            evaluations[i] = evaluation
+            _cache_evaluation(pairs[i][0], cache_vectors[i], evaluation)
+        
+        logger.info(f"Evaluated {len(pending)} responses in a single batch")
+        return evaluations
+    except Exception as e:
+        logger.error(f"Error batch evaluating responses: {str(e)}")
+        raise
+
 async def evaluate_interview(
     scenario_title: str, 
     scenario_description: str, 
     final_summary: str, 
-    detailed_evaluations: List[DetailedEvaluation]
+    detailed_evaluations: List[DetailedEvaluation],
+    formatted_evaluations: Optional[List[str]] = None
 ) -> OverallEvaluation:
     """
     Evaluate the entire interview based on all responses.
@@ -97,6 +297,8 @@ async def evaluate_interview(
         scenario_description: Description of the scenario
         final_summary: Summary of the interview
         detailed_evaluations: List of detailed evaluations for each response
+        formatted_evaluations: The detailed evaluations already formatted for the prompt.
+            If None, they are formatted from detailed_evaluations.
         
     Returns:
         Overall evaluation of the interview
@@ -108,29 +310,14 @@ async def evaluate_interview(
     
     try:
         # Format the detailed evaluations for the prompt
-        formatted_evals = []
-        for i, eval in enumerate(detailed_evaluations):
-            eval_dict = eval.dict()
-            eval_text = f"EVALUATION {i+1}:\n"
-            eval_text += f"- Relevance: {eval_dict['relevance_score']}/10\n"
-            eval_text += f"- Completeness: {eval_dict['completeness_score']}/10\n"
-            eval_text += f"- Clarity: {eval_dict['clarity_score']}/10\n"
-            eval_text += f"- Technical Accuracy: {eval_dict['technical_accuracy_score']}/10\n"
-            eval_text += f"- Professional Tone: {eval_dict['professional_tone_score']}/10\n"
-            eval_text += f"- Grammar: {eval_dict['grammar_score']}/10\n"
-            eval_text += f"- Vocabulary: {eval_dict['vocabulary_score']}/10\n"
-            eval_text += f"- Strengths: {', '.join(eval_dict['strengths'])}\n"
-            eval_text += f"- Weaknesses: {', '.join(eval_dict['weaknesses'])}\n"
-            
-            formatted_evals.append(eval_text)
-        
-        # Create the evaluation chain
-        overall_eval_prompt = initialize_overall_evaluation_prompt()
-        overall_eval_parser = PydanticOutputParser(pydantic_object=OverallEvaluation)
-        eval_chain = overall_eval_prompt | _llm | overall_eval_parser
+        if formatted_evaluations is None:
+            formatted_evaluations = [_format_evaluation_summary(evaluation) for evaluation in detailed_evaluations]
+        formatted_evals = [
+            f"EVALUATION {i}:\n{text}" for i, text in enumerate(formatted_evaluations, start=1)
+        ]
         
         # Evaluate the interview
-        overall_evaluation = await eval_chain.ainvoke({
+        overall_evaluation = await _overall_eval_chain.ainvoke({
             "scenario_title": scenario_title,
             "scenario_description": scenario_description,
             "final_summary": final_summary,
@@ -143,6 +330,17 @@ async def evaluate_interview(
         logger.error(f"Error evaluating interview: {str(e)}")
         raise
 
+async def _evaluate_indexed(
+    index: int,
+    question: str,
+    response: str
+) -> Tuple[int, Union[DetailedEvaluation, Exception]]:
+    """Evaluate a response, returning its index with the evaluation or the exception raised."""
+    try:
+        return index, await evaluate_response(question, response)
+    except Exception as e:
+        return index, e
+
 async def generate_evaluation_report(
     scenario: Dict[str, Any],
     responses: Dict[str, str],
@@ -160,30 +358,56 @@ async def generate_evaluation_report(
         Comprehensive evaluation report
     """
     try:
-        # Evaluate each response
-        detailed_evaluations = {}
+        # Resolve the question text for each response
+        question_text_by_id = {q.get("id"): q.get("question", "") for q in scenario.get("questions", [])}
+        items = []
         for question_id, response in responses.items():
-            # Find the question text
-            question_text = ""
-            for q in scenario.get("questions", []):
-                if q.get("id") == question_id:
-                    question_text = q.get("question", "")
-                    break
-            
+            question_text = question_text_by_id.get(question_id, "")
             if not question_text:
                 logger.warning(f"Question with ID {question_id} not found in scenario")
                 continue
-            
-            # Evaluate the response
-            evaluation = await evaluate_response(question_text, response)
+            items.append((question_id, question_text, response))
+        
+        # Evaluate all responses in one batched call, falling back to concurrent
+        # per-response evaluation for a single response or if the batch fails
+        evaluations = None
+        if len(items) > 1:
+            try:
+                evaluations = await batch_evaluate_responses(
+                    [(question_text, response) for _, question_text, response in items]
+                )
+            except Exception as e:
+                logger.warning(f"Batch evaluation failed, evaluating responses individually: {str(e)}")
+        
+        formatted = [None] * len(items)
+        if evaluations is None:
+            # Format each evaluation for the overall prompt as soon as it completes
+            evaluations = [None] * len(items)
+            for next_done in asyncio.as_completed([
+                _evaluate_indexed(i, question_text, response)
+                for i, (_, question_text, response) in enumerate(items)
+            ]):
+                i, evaluation = await next_done
+                evaluations[i] = evaluation
+                if not isinstance(evaluation, Exception):
+                    formatted[i] = _format_evaluation_summary(evaluation)
+        
+        detailed_evaluations = {}
+        formatted_evaluations = []
+        for (question_id, _, _), evaluation, text in zip(items, evaluations, formatted):
+            if isinstance(evaluation, Exception):
+                logger.error(f"Skipping evaluation for question {question_id}: {str(evaluation)}")
+                continue
             detailed_evaluations[question_id] = evaluation
+            formatted_evaluations.append(text if text is not None else _format_evaluation_summary(evaluation))
         
         # Generate overall evaluation
         overall_evaluation = await evaluate_interview(
             scenario.get("title", ""),
             scenario.get("description", ""),
             final_summary,
-            list(detailed_evaluations.values())
+            list(detailed_evaluations.values()),
+            formatted_evaluations
         )
         
         # Create the final report
@@ -198,9 +422,9 @@ async def generate_evaluation_report(
             "timestamp": datetime.now().isoformat(),
             "final_summary": final_summary,
             "detailed_evaluations": {
-                q_id: eval.dict() for q_id, eval in detailed_evaluations.items()
+                q_id: evaluation.model_dump() for q_id, evaluation in detailed_evaluations.items()
             },
-            "overall_evaluation": overall_evaluation.dict()
+            "overall_evaluation": overall_evaluation.model_dump()
         }
         
         logger.info(f"Generated comprehensive evaluation report for scenario {scenario.get('id', '')}")
@@ -209,6 +433,17 @@ async def generate_evaluation_report(
         logger.error(f"Error generating evaluation report: {str(e)}")
         raise
 
+# Detailed evaluation score fields and the metric each one is averaged into
+_SCORE_METRICS = (
+    ("relevance_score", "avg_relevance_score"),
+    ("completeness_score", "avg_completeness_score"),
+    ("clarity_score", "avg_clarity_score"),
+    ("technical_accuracy_score", "avg_technical_score"),
+    ("professional_tone_score", "avg_professional_score"),
+    ("grammar_score", "avg_grammar_score"),
+    ("vocabulary_score", "avg_vocabulary_score"),
+)
+
 def calculate_metrics(report: Dict[str, Any]) -> Dict[str, Any]:
     """
     Calculate aggregate metrics from an evaluation report.
@@ -223,36 +458,18 @@ def calculate_metrics(report: Dict[str, Any]) -> Dict[str, Any]:
         # Extract detailed evaluations
         detailed_evals = report.get("detailed_evaluations", {})
         
-        # Calculate average scores
-        relevance_scores = []
-        completeness_scores = []
-        clarity_scores = []
-        technical_scores = []
-        professional_scores = []
-        grammar_scores = []
-        vocabulary_scores = []
+        # Gather all scores into a single (evaluations x criteria) array and average per column
+        scores = np.array(
+            [[eval_data.get(field, 0) for field, _ in _SCORE_METRICS] for eval_data in detailed_evals.values()],
+            dtype=np.int8
+        ).reshape(-1, len(_SCORE_METRICS))
+        means = mean_scores(scores).tolist() if scores.size else [0] * len(_SCORE_METRICS)
         
-        for eval_id, eval_data in detailed_evals.items():
-            relevance_scores.append(eval_data.get("relevance_score", 0))
-            completeness_scores.append(eval_data.get("completeness_score", 0))
-            clarity_scores.append(eval_data.get("clarity_score", 0))
-            technical_scores.append(eval_data.get("technical_accuracy_score", 0))
-            professional_scores.append(eval_data.get("professional_tone_score", 0))
-            grammar_scores.append(eval_data.get("grammar_score", 0))
-            vocabulary_scores.append(eval_data.get("vocabulary_score", 0))
-        
-        # Calculate averages
-        metrics = {
-            "avg_relevance_score": sum(relevance_scores) / len(relevance_scores) if relevance_scores else 0,
-            "avg_completeness_score": sum(completeness_scores) / len(completeness_scores) if completeness_scores else 0,
-            "avg_clarity_score": sum(clarity_scores) / len(clarity_scores) if clarity_scores else 0,
-            "avg_technical_score": sum(technical_scores) / len(technical_scores) if technical_scores else 0,
-            "avg_professional_score": sum(professional_scores) / len(professional_scores) if professional_scores else 0,
-            "avg_grammar_score": sum(grammar_scores) / len(grammar_scores) if grammar_scores else 0,
-            "avg_vocabulary_score": sum(vocabulary_scores) / len(vocabulary_scores) if vocabulary_scores else 0,
+        metrics = dict(zip((metric for _, metric in _SCORE_METRICS), means))
+        metrics.update({
             "overall_score": report.get("overall_evaluation", {}).get("overall_score", 0),
             "hiring_recommendation": report.get("overall_evaluation", {}).get("hiring_recommendation", "")
-        }
+        })
         
         return metrics
     except Exception as e:
@@ -10,7 +10,7 @@ from langgraph.graph import StateGraph, START, END
 from langgraph.constants import Send
 
 from domains.utils import get_chat_llm
-from domains.stategraph import InterviewAnalysisState
+from domains.stategraph import InterviewAnalysisStateFast
 
 
 class MasterAgentState(TypedDict):
@@ -126,17 +126,8 @@ async def run_evaluation_tools(state: MasterAgentState, tools) -> MasterAgentSta
             
             contents.append(f"{role}: {message.content}")
         
-        # Create an InterviewAnalysisState for the tools
-        analysis_state = InterviewAnalysisState(
-            contents=contents,
-            final_summary="",
-            grammar_evaluation=[],
-            spelling_mistakes_evaluation=[],
-            vocabulary_score_evaluation=0,
-            sentence_structure_score=0,
-            professional_tone_score=0,
-            overall_language_score=0
-        )
+        # Create a slotted analysis state for the tools
+        analysis_state = InterviewAnalysisStateFast(contents=contents)
         
         # Run tools based on the tools_to_run list or run all tools if empty
         tools_to_run = state.get("tools_to_run", [])
@@ -146,7 +137,7 @@ async def run_evaluation_tools(state: MasterAgentState, tools) -> MasterAgentSta
             logger.info("Running interview summarization")
             try:
                 analysis_state = await tools["summarize_interview_history"](analysis_state)
-                state["final_summary"] = analysis_state.get("final_summary", "")
+                state["final_summary"] = analysis_state.final_summary
             except Exception as e:
                 logger.error(f"Error in summarization: {str(e)}")
                 state["final_summary"] = "Error generating summary."
@@ -166,7 +157,7 @@ async def run_evaluation_tools(state: MasterAgentState, tools) -> MasterAgentSta
             logger.info("Running validation")
             try:
                 validation_state = tools["validation_tool"](analysis_state)
-                state["validation_result"] = validation_state.get("validation_result", "")
+                state["validation_result"] = validation_state.validation_result or ""
             except Exception as e:
                 logger.error(f"Error in validation: {str(e)}")
                 state["validation_result"] = "Error performing validation."
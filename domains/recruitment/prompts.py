@@ -1,5 +1,7 @@
-from langchain.prompts import PromptTemplate
-from langchain_core.output_parsers import StrOutputParser, JsonOutputParser
+from functools import lru_cache
+
+from langchain.prompts import PromptTemplate, ChatPromptTemplate
+from langchain_core.output_parsers import StrOutputParser
 from langchain.output_parsers import PydanticOutputParser
 from pydantic import BaseModel, Field
 
@@ -19,6 +21,15 @@ class ResponseAnalysis(BaseModel):
     reasoning: str = Field(description="Reasoning behind the scores")
 
 
+class ValidationReport(BaseModel):
+    comprehensiveness: str = Field(description="Does the assessment cover all key aspects of candidate evaluation? Yes/No with explanation")
+    evidence_based: str = Field(description="Are the ratings and conclusions supported by specific examples from the interview? Yes/No with explanation")
+    consistency: str = Field(description="Are the ratings consistent with the described strengths and weaknesses? Yes/No with explanation")
+    actionable_feedback: str = Field(description="Does the assessment provide clear areas for improvement? Yes/No with explanation")
+    fairness: str = Field(description="Is the assessment balanced and free from apparent bias? Yes/No with explanation")
+    overall_validity: str = Field(description="Is this a valid and useful assessment report? Yes/No with explanation")
+
+
 SYSTEM_PROMPT = """You are an HR interviewer conducting a technical assessment interview. 
 Your goal is to evaluate the candidate's responses to technical questions.
 Be professional, courteous, and thorough in your interactions.
@@ -35,11 +46,13 @@ CURRENT QUESTION: {question}
 Please analyze the candidate's response and determine if you need to ask a clarifying follow-up question.
 """
 
+# The static instructions of each chat prompt are kept in the system message and
+# the per-call inputs in the trailing human message, so the instruction prefix is
+# identical across calls and can be served from the provider's prompt cache.
+
 CLARIFICATION_PROMPT_TEMPLATE = """
 You are conducting a technical interview. The candidate has provided a response to your question, but you need to determine if clarification is needed.
-
-ORIGINAL QUESTION: {question}
-CANDIDATE'S RESPONSE: {response}
+The original question and the candidate's response are given in the next message.
 
 Analyze the response and determine if you need to ask a clarifying follow-up question. 
 If the response is unclear, incomplete, or doesn't fully address the question, formulate a specific follow-up question.
@@ -48,11 +61,14 @@ If the response is clear and complete, indicate that no clarification is needed.
 {format_instructions}
 """
 
+CLARIFICATION_INPUT_TEMPLATE = """
+ORIGINAL QUESTION: {question}
+CANDIDATE'S RESPONSE: {response}
+"""
+
 RESPONSE_ANALYSIS_PROMPT_TEMPLATE = """
 You are evaluating a candidate's response to a technical interview question.
-
-QUESTION: {question}
-CANDIDATE'S RESPONSE: {response}
+The question and the candidate's response are given in the next message.
 
 Provide a detailed analysis of the response based on the following criteria:
 1. Relevance: How directly the response addresses the question
@@ -66,28 +82,40 @@ For each criterion, provide a score from 1-10 and brief justification.
 {format_instructions}
 """
 
+RESPONSE_ANALYSIS_INPUT_TEMPLATE = """
+QUESTION: {question}
+CANDIDATE'S RESPONSE: {response}
+"""
+
 NEXT_QUESTION_PROMPT_TEMPLATE = """
 You are conducting a technical interview. Based on the conversation so far, determine the most appropriate next question to ask.
+The interview scenario, the conversation history and the questions available are given in the following messages.
+
+Select the most appropriate next question from the available questions. Choose a question that logically follows from the previous discussion and helps evaluate different aspects of the candidate's knowledge.
 
+Return only the ID of the selected question.
+"""
+
+# Stable for the whole interview, so it follows the static instructions
+NEXT_QUESTION_SCENARIO_TEMPLATE = """
 SCENARIO: {scenario_title}
 DESCRIPTION: {scenario_description}
-QUESTIONS AVAILABLE:
-{available_questions}
+"""
 
+NEXT_QUESTION_HISTORY_TEMPLATE = """
 CONVERSATION HISTORY:
 {conversation_history}
+"""
 
-Select the most appropriate next question from the available questions. Choose a question that logically follows from the previous discussion and helps evaluate different aspects of the candidate's knowledge.
-
-Return only the ID of the selected question.
+NEXT_QUESTION_INPUT_TEMPLATE = """
+QUESTIONS AVAILABLE:
+{available_questions}
 """
 
 # ===== Summarization Prompts =====
 
 SUMMARY_MAP_TEMPLATE = """
-Analyze this interview Q&A:
-
-{document}
+Analyze the interview Q&A given at the end of this message.
 
 Provide a comprehensive evaluation with the following sections:
 1. Content Summary: Main experience, skills, and contributions mentioned
@@ -98,37 +126,43 @@ Provide a comprehensive evaluation with the following sections:
 6. Professional Language: Rate from 1-10 the level of professional terminology used
 7. Emotional Tone: Describe the overall sentiment (positive, neutral, negative, confident, hesitant, etc.)
 8. Clarity & Structure: Rate from 1-10 how well-organized and clear the response is
+
+INTERVIEW Q&A:
+{document}
 """
 
 REDUCE_TEMPLATE = """
-Combine the following detailed interview Q&A evaluations into a comprehensive candidate assessment report:
-
-{document}
+Combine the detailed interview Q&A evaluations given at the end of this message into a comprehensive candidate assessment report.
 
 Your report should include:
 1. EXECUTIVE SUMMARY: A brief overview of the candidate's performance
 2. TECHNICAL SKILLS ASSESSMENT: Synthesize the content summaries to evaluate technical competence
 3. COMMUNICATION EVALUATION:
   - Overall Grammar & Spelling: Summarize all issues found across answers
-  - Average Confidence Level: Calculate the average score
-  - Average Directness: Calculate the average score
-  - Average Completeness: Calculate the average score
-  - Professional Language Usage: Calculate the average score
+  - Average Confidence Level: Report the average score
+  - Average Directness: Report the average score
+  - Average Completeness: Report the average score
+  - Professional Language Usage: Report the average score
   - Dominant Emotional Tone: Identify patterns in emotional tone across answers
-  - Average Clarity & Structure: Calculate the average score
+  - Average Clarity & Structure: Report the average score
+  Use the averages given under SCORE AVERAGES; only calculate an average yourself when it is not available there.
 
 4. STRENGTHS: List 3-5 key strengths based on the evaluation
 5. OVERALL RATING: Provide a final score from 1-10 with brief justification
 
 Format the report in a clear, structured manner with section headings.
+
+SCORE AVERAGES:
+{score_averages}
+
+Q&A EVALUATIONS:
+{document}
 """
 
 # ===== Evaluation Prompts =====
 
 VALIDATION_TEMPLATE = """
-Validate the quality and completeness of the following interview assessment report:
-
-{summary}
+Validate the quality and completeness of the interview assessment report given at the end of this message.
 
 Provide a detailed validation with the following criteria:
 1. Comprehensiveness: Does the assessment cover all key aspects of candidate evaluation? (Yes/No with explanation)
@@ -138,31 +172,25 @@ Provide a detailed validation with the following criteria:
 5. Fairness: Is the assessment balanced and free from apparent bias? (Yes/No with explanation)
 6. Overall Validity: Is this a valid and useful assessment report? (Yes/No with explanation)
 
-Format your response with clear section headings.
-{
-    "comprehensiveness": "explanation",
-    "evidence_based": "explanation",
-    "consistency": "explanation",
-    "actionable_feedback": "explanation",
-    "fairness": "explanation",
-    "overall_validity": "explanation"
-}
+{format_instructions}
+
+ASSESSMENT REPORT:
+{summary}
 """
 
 GRAMMAR_CHECK_TEMPLATE = """
-Analyze the following text for grammar and spelling errors:
-
-{text}
+Analyze the text given at the end of this message for grammar and spelling errors.
 
 Provide a detailed list of all grammar and spelling issues found. 
 If no issues are found, state "No grammar or spelling issues found."
+
+TEXT:
+{text}
 """
 
 DETAILED_EVALUATION_PROMPT = """
 You are an expert technical interviewer evaluating a candidate's response to a technical question.
-
-QUESTION: {question}
-CANDIDATE'S RESPONSE: {response}
+The question and the candidate's response are given in the next message.
 
 Provide a detailed evaluation of the response based on the following criteria:
 1. Relevance: How directly the response addresses the question
@@ -179,17 +207,38 @@ Also identify key strengths and weaknesses in the response.
 {format_instructions}
 """
 
-OVERALL_EVALUATION_PROMPT = """
-You are an HR professional evaluating a candidate's overall performance in a technical interview.
+DETAILED_EVALUATION_INPUT_TEMPLATE = """
+QUESTION: {question}
+CANDIDATE'S RESPONSE: {response}
+"""
 
-SCENARIO: {scenario_title}
-DESCRIPTION: {scenario_description}
+BATCH_EVALUATION_PROMPT = """
+You are an expert technical interviewer evaluating a candidate's responses to several technical questions.
+The numbered questions and the candidate's responses are given in the next message.
 
-INTERVIEW SUMMARY:
-{final_summary}
+Evaluate each response independently based on the following criteria:
+1. Relevance: How directly the response addresses the question
+2. Completeness: How thoroughly the question was answered
+3. Clarity: How well-organized and clear the response is
+4. Technical Accuracy: How technically sound the concepts and solutions are
+5. Professional Tone: How professional the language and tone are
+6. Grammar: Quality of grammar and spelling
+7. Vocabulary: Richness and appropriateness of vocabulary
 
-DETAILED EVALUATIONS:
-{detailed_evaluations}
+For each criterion, provide a score from 1-10 and brief justification.
+Also identify key strengths and weaknesses in each response.
+Return exactly one evaluation per response, in the same order as the responses are numbered.
+
+{format_instructions}
+"""
+
+BATCH_EVALUATION_INPUT_TEMPLATE = """
+{responses}
+"""
+
+OVERALL_EVALUATION_PROMPT = """
+You are an HR professional evaluating a candidate's overall performance in a technical interview.
+The scenario, interview summary and detailed evaluations are given in the next message.
 
 Provide an overall evaluation of the candidate based on the entire interview, considering:
 1. Technical Skills: Depth and breadth of technical knowledge
@@ -205,6 +254,17 @@ Provide a hiring recommendation (Strongly Recommend, Recommend, Neutral, Do Not
 {format_instructions}
 """
 
+OVERALL_EVALUATION_INPUT_TEMPLATE = """
+SCENARIO: {scenario_title}
+DESCRIPTION: {scenario_description}
+
+INTERVIEW SUMMARY:
+{final_summary}
+
+DETAILED EVALUATIONS:
+{detailed_evaluations}
+"""
+
 # ===== Master Agent Prompts =====
 
 MASTER_AGENT_SYSTEM_PROMPT = """
@@ -259,31 +319,55 @@ Format the report in a clear, professional manner suitable for HR records.
 
 # ===== Prompt Initialization Functions =====
 
-def initialize_clarification_prompt() -> PromptTemplate:
-    """Initialize the clarification prompt with the PydanticOutputParser."""
-    clarification_parser = PydanticOutputParser(pydantic_object=ClarificationResponse)
-    return PromptTemplate(
-        template=CLARIFICATION_PROMPT_TEMPLATE,
-        input_variables=["question", "response"],
-        partial_variables={"format_instructions": clarification_parser.get_format_instructions()}
-    )
-
-def initialize_response_analysis_prompt() -> PromptTemplate:
-    """Initialize the response analysis prompt with the PydanticOutputParser."""
-    response_analysis_parser = PydanticOutputParser(pydantic_object=ResponseAnalysis)
-    return PromptTemplate(
-        template=RESPONSE_ANALYSIS_PROMPT_TEMPLATE,
-        input_variables=["question", "response"],
-        partial_variables={"format_instructions": response_analysis_parser.get_format_instructions()}
-    )
-
-def initialize_next_question_prompt() -> PromptTemplate:
-    """Initialize the next question prompt."""
-    return PromptTemplate(
-        template=NEXT_QUESTION_PROMPT_TEMPLATE,
-        input_variables=["scenario_title", "scenario_description", "available_questions", "conversation_history"]
-    )
-
+@lru_cache(maxsize=None)
+def get_format_instructions(pydantic_object: type) -> str:
+    """Get the PydanticOutputParser format instructions for a model, computed once per model."""
+    return PydanticOutputParser(pydantic_object=pydantic_object).get_format_instructions()
+
+@lru_cache(maxsize=None)
+def initialize_clarification_prompt(include_format_instructions: bool = True) -> ChatPromptTemplate:
+    """
+    Initialize the clarification prompt.
+    
+    Args:
+        include_format_instructions: Whether to embed the JSON format instructions. Not needed
+            when the LLM returns the schema through native structured output.
+    """
+    return ChatPromptTemplate.from_messages([
+        ("system", CLARIFICATION_PROMPT_TEMPLATE),
+        ("human", CLARIFICATION_INPUT_TEMPLATE)
+    ]).partial(format_instructions=get_format_instructions(ClarificationResponse) if include_format_instructions else "")
+
+@lru_cache(maxsize=None)
+def initialize_response_analysis_prompt(include_format_instructions: bool = True) -> ChatPromptTemplate:
+    """
+    Initialize the response analysis prompt.
+    
+    Args:
+        include_format_instructions: Whether to embed the JSON format instructions. Not needed
+            when the LLM returns the schema through native structured output.
+    """
+    return ChatPromptTemplate.from_messages([
+        ("system", RESPONSE_ANALYSIS_PROMPT_TEMPLATE),
+        ("human", RESPONSE_ANALYSIS_INPUT_TEMPLATE)
+    ]).partial(format_instructions=get_format_instructions(ResponseAnalysis) if include_format_instructions else "")
+
+@lru_cache(maxsize=None)
+def initialize_next_question_prompt() -> ChatPromptTemplate:
+    """
+    Initialize the next question prompt.
+    
+    Messages are ordered from most to least stable (instructions, scenario, history,
+    available questions) so consecutive turns of an interview share the longest prefix.
+    """
+    return ChatPromptTemplate.from_messages([
+        ("system", NEXT_QUESTION_PROMPT_TEMPLATE),
+        ("system", NEXT_QUESTION_SCENARIO_TEMPLATE),
+        ("human", NEXT_QUESTION_HISTORY_TEMPLATE),
+        ("human", NEXT_QUESTION_INPUT_TEMPLATE)
+    ])
+
+@lru_cache(maxsize=None)
 def initialize_summary_map_prompt() -> PromptTemplate:
     """Initialize the summary map prompt."""
     return PromptTemplate(
@@ -292,22 +376,34 @@ def initialize_summary_map_prompt() -> PromptTemplate:
         output_parser=StrOutputParser()
     )
 
+@lru_cache(maxsize=None)
 def initialize_reduce_prompt() -> PromptTemplate:
     """Initialize the reduce prompt."""
     return PromptTemplate(
         template=REDUCE_TEMPLATE,
         input_variables=["document"],
+        partial_variables={"score_averages": "Not available"},
         output_parser=StrOutputParser()
     )
 
-def initialize_validation_prompt() -> PromptTemplate:
-    """Initialize the validation prompt."""
+@lru_cache(maxsize=None)
+def initialize_validation_prompt(include_format_instructions: bool = True) -> PromptTemplate:
+    """
+    Initialize the validation prompt.
+    
+    Args:
+        include_format_instructions: Whether to embed the JSON format instructions. Not needed
+            when the LLM returns the schema through native structured output.
+    """
     return PromptTemplate(
         template=VALIDATION_TEMPLATE,
         input_variables=["summary"],
-        output_parser=JsonOutputParser()
+        partial_variables={
+            "format_instructions": get_format_instructions(ValidationReport) if include_format_instructions else ""
+        }
     )
 
+@lru_cache(maxsize=None)
 def initialize_grammar_check_prompt() -> PromptTemplate:
     """Initialize the grammar check prompt."""
     return PromptTemplate(
@@ -316,26 +412,52 @@ def initialize_grammar_check_prompt() -> PromptTemplate:
         output_parser=StrOutputParser()
     )
 
-def initialize_detailed_evaluation_prompt() -> PromptTemplate:
-    """Initialize the detailed evaluation prompt."""
+@lru_cache(maxsize=None)
+def initialize_detailed_evaluation_prompt(include_format_instructions: bool = True) -> ChatPromptTemplate:
+    """
+    Initialize the detailed evaluation prompt.
+    
+    Args:
+        include_format_instructions: Whether to embed the JSON format instructions. Not needed
+            when the LLM returns the schema through native structured output.
+    """
     from domains.recruitment.evaluation import DetailedEvaluation
-    detailed_eval_parser = PydanticOutputParser(pydantic_object=DetailedEvaluation)
-    return PromptTemplate(
-        template=DETAILED_EVALUATION_PROMPT,
-        input_variables=["question", "response"],
-        partial_variables={"format_instructions": detailed_eval_parser.get_format_instructions()}
-    )
-
-def initialize_overall_evaluation_prompt() -> PromptTemplate:
-    """Initialize the overall evaluation prompt."""
+    return ChatPromptTemplate.from_messages([
+        ("system", DETAILED_EVALUATION_PROMPT),
+        ("human", DETAILED_EVALUATION_INPUT_TEMPLATE)
+    ]).partial(format_instructions=get_format_instructions(DetailedEvaluation) if include_format_instructions else "")
+
+@lru_cache(maxsize=None)
+def initialize_batch_evaluation_prompt(include_format_instructions: bool = True) -> ChatPromptTemplate:
+    """
+    Initialize the prompt that evaluates several responses in a single call.
+    
+    Args:
+        include_format_instructions: Whether to embed the JSON format instructions. Not needed
+            when the LLM returns the schema through native structured output.
+    """
+    from domains.recruitment.evaluation import BatchEvaluation
+    return ChatPromptTemplate.from_messages([
+        ("system", BATCH_EVALUATION_PROMPT),
+        ("human", BATCH_EVALUATION_INPUT_TEMPLATE)
+    ]).partial(format_instructions=get_format_instructions(BatchEvaluation) if include_format_instructions else "")
+
+@lru_cache(maxsize=None)
+def initialize_overall_evaluation_prompt(include_format_instructions: bool = True) -> ChatPromptTemplate:
+    """
+    Initialize the overall evaluation prompt.
+    
+    Args:
+        include_format_instructions: Whether to embed the JSON format instructions. Not needed
+            when the LLM returns the schema through native structured output.
+    """
     from domains.recruitment.evaluation import OverallEvaluation
-    overall_eval_parser = PydanticOutputParser(pydantic_object=OverallEvaluation)
-    return PromptTemplate(
-        template=OVERALL_EVALUATION_PROMPT,
-        input_variables=["scenario_title", "scenario_description", "final_summary", "detailed_evaluations"],
-        partial_variables={"format_instructions": overall_eval_parser.get_format_instructions()}
-    )
+    return ChatPromptTemplate.from_messages([
+        ("system", OVERALL_EVALUATION_PROMPT),
+        ("human", OVERALL_EVALUATION_INPUT_TEMPLATE)
+    ]).partial(format_instructions=get_format_instructions(OverallEvaluation) if include_format_instructions else "")
 
+@lru_cache(maxsize=None)
 def initialize_final_report_prompt() -> PromptTemplate:
     """Initialize the final report prompt."""
     return PromptTemplate(
@@ -1,23 +1,40 @@
-import json
+import orjson
 import random
 import os
 from typing import List, Dict, Any, Optional, Union
 from loguru import logger
 from datetime import datetime
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 # Global variable to store loaded scenarios
 _scenarios = []
 _scenarios_path = None
 
-def initialize_scenario_manager(scenarios_path: str = None) -> None:
+# Dedicated random generator for scenario and question selection
+_rng = random.Random()
+
+# Indexes over _scenarios, rebuilt whenever scenarios are loaded or modified
+_scenarios_by_id: Dict[str, Dict[str, Any]] = {}
+_scenarios_by_difficulty: Dict[str, List[Dict[str, Any]]] = {}
+_positions_by_topic: Dict[str, List[int]] = {}
+
+def initialize_scenario_manager(scenarios_path: str = None, seed: Optional[int] = None) -> None:
     """
     Initialize the scenario manager.
     
     Args:
         scenarios_path: Path to the scenarios JSON file. If None, uses default path.
+        seed: Seed for random scenario and question selection. If None, selection is not reproducible.
     """
     global _scenarios_path, _scenarios
     
+    if seed is not None:
+        _rng.seed(seed)
+    
     _scenarios_path = scenarios_path or os.path.join(
         os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 
         "data", 
@@ -33,21 +50,43 @@ def load_scenarios() -> None:
     global _scenarios, _scenarios_path
     
     try:
-        with open(_scenarios_path, 'r') as file:
-            data = json.load(file)
-            _scenarios = data.get('scenarios', [])
+        now = datetime.now().isoformat()
+        with open(_scenarios_path, 'rb') as file:
+            # Stream scenarios one at a time when ijson is available, so a large file
+            # is never held in memory twice
+            if ijson is not None:
+                scenarios = ijson.items(file, 'scenarios.item', use_float=True)
+            else:
+                scenarios = orjson.loads(file.read()).get('scenarios', [])
             
-        # Add version and timestamp if not present
-        for scenario in _scenarios:
-            if 'version' not in scenario:
-                scenario['version'] = '1.0'
-            if 'last_updated' not in scenario:
-                scenario['last_updated'] = datetime.now().isoformat()
-                
+            # Add version and timestamp if not present
+            _scenarios = []
+            for scenario in scenarios:
+                if 'version' not in scenario:
+                    scenario['version'] = '1.0'
+                if 'last_updated' not in scenario:
+                    scenario['last_updated'] = now
+                _scenarios.append(scenario)
+        
+        _rebuild_indexes()
         logger.info(f"Loaded {len(_scenarios)} scenarios from {_scenarios_path}")
     except Exception as e:
         logger.error(f"Error loading scenarios: {str(e)}")
         _scenarios = []
+        _rebuild_indexes()
+
+def _rebuild_indexes() -> None:
+    """Rebuild the ID, difficulty and topic indexes over the loaded scenarios."""
+    global _scenarios_by_id, _scenarios_by_difficulty, _positions_by_topic
+    
+    _scenarios_by_id = {}
+    _scenarios_by_difficulty = {}
+    _positions_by_topic = {}
+    for position, scenario in enumerate(_scenarios):
+        _scenarios_by_id.setdefault(scenario.get('id'), scenario)
+        _scenarios_by_difficulty.setdefault(scenario.get('difficulty'), []).append(scenario)
+        for topic in set(scenario.get('topics', [])):
+            _positions_by_topic.setdefault(topic, []).append(position)
 
 def get_all_scenarios() -> List[Dict[str, Any]]:
     """
@@ -68,9 +107,9 @@ def get_scenario_by_id(scenario_id: str) -> Optional[Dict[str, Any]]:
     Returns:
         The scenario if found, None otherwise.
     """
-    for scenario in _scenarios:
-        if scenario.get('id') == scenario_id:
-            return scenario
+    scenario = _scenarios_by_id.get(scenario_id)
+    if scenario is not None:
+        return scenario
     logger.warning(f"Scenario with ID {scenario_id} not found")
     return None
 
@@ -85,7 +124,7 @@ def select_random_scenario() -> Optional[Dict[str, Any]]:
         logger.warning("No scenarios available to select from")
         return None
     
-    selected = random.choice(_scenarios)
+    selected = _rng.choice(_scenarios)
     logger.info(f"Randomly selected scenario: {selected.get('id')} - {selected.get('title')}")
     return selected
 
@@ -107,10 +146,14 @@ def select_random_scenarios(count: int = 1) -> List[Dict[str, Any]]:
     count = min(count, len(_scenarios))
     
     # Select random scenarios without replacement
-    selected = random.sample(_scenarios, count)
+    selected = _rng.sample(_scenarios, count)
     
-    scenario_ids = [s.get('id') for s in selected]
-    logger.info(f"Randomly selected {count} scenarios: {', '.join(scenario_ids)}")
+    # The ID list is only built if the message is actually emitted
+    logger.opt(lazy=True).info(
+        "Randomly selected {} scenarios: {}",
+        lambda: count,
+        lambda: ", ".join(s.get('id') for s in selected)
+    )
     
     return selected
 
@@ -127,12 +170,11 @@ def filter_scenarios_by_tags(tags: List[str]) -> List[Dict[str, Any]]:
     if not tags:
         return _scenarios
     
-    filtered = []
-    for scenario in _scenarios:
-        scenario_topics = scenario.get('topics', [])
-        # Check if any of the specified tags match the scenario's topics
-        if any(tag in scenario_topics for tag in tags):
-            filtered.append(scenario)
+    # Union of the scenarios indexed under any of the tags, in their original order
+    positions = set()
+    for tag in tags:
+        positions.update(_positions_by_topic.get(tag, ()))
+    filtered = [_scenarios[position] for position in sorted(positions)]
     
     logger.info(f"Filtered scenarios by tags {tags}, found {len(filtered)} matches")
     return filtered
@@ -147,7 +189,7 @@ def filter_scenarios_by_difficulty(difficulty: str) -> List[Dict[str, Any]]:
     Returns:
         List of scenarios with the specified difficulty.
     """
-    filtered = [s for s in _scenarios if s.get('difficulty') == difficulty]
+    filtered = list(_scenarios_by_difficulty.get(difficulty, []))
     logger.info(f"Filtered scenarios by difficulty {difficulty}, found {len(filtered)} matches")
     return filtered
 
@@ -170,7 +212,7 @@ def get_random_question_from_scenario(scenario_id: str) -> Optional[Dict[str, st
         logger.warning(f"No questions found in scenario {scenario_id}")
         return None
     
-    question = random.choice(questions)
+    question = _rng.choice(questions)
     logger.info(f"Selected random question {question.get('id')} from scenario {scenario_id}")
     return question
 
@@ -188,8 +230,8 @@ def save_scenarios(scenarios_path: str = None) -> bool:
     
     path = scenarios_path or _scenarios_path
     try:
-        with open(path, 'w') as file:
-            json.dump({'scenarios': _scenarios}, file, indent=4)
+        with open(path, 'wb') as file:
+            file.write(orjson.dumps({'scenarios': _scenarios}, option=orjson.OPT_INDENT_2))
         logger.info(f"Saved {len(_scenarios)} scenarios to {path}")
         return True
     except Exception as e:
@@ -203,29 +245,46 @@ def add_scenario(scenario: Dict[str, Any]) -> bool:
     Args:
         scenario: The scenario to add.
         
+    Returns:
+        True if successful, False otherwise.
+    """
+    return add_scenarios([scenario])
+
+def add_scenarios(scenarios: List[Dict[str, Any]]) -> bool:
+    """
+    Add several new scenarios, saving them once. Nothing is added if any scenario is invalid.
+    
+    Args:
+        scenarios: The scenarios to add.
+        
     Returns:
         True if successful, False otherwise.
     """
     global _scenarios
     
-    # Validate required fields
+    # Validate required fields and check for duplicate IDs
     required_fields = ['id', 'title', 'description', 'questions']
-    for field in required_fields:
-        if field not in scenario:
-            logger.error(f"Scenario is missing required field: {field}")
+    new_ids = set()
+    for scenario in scenarios:
+        for field in required_fields:
+            if field not in scenario:
+                logger.error(f"Scenario is missing required field: {field}")
+                return False
+        
+        if scenario['id'] in _scenarios_by_id or scenario['id'] in new_ids:
+            logger.error(f"Scenario with ID {scenario['id']} already exists")
             return False
-    
-    # Check for duplicate ID
-    if any(s.get('id') == scenario['id'] for s in _scenarios):
-        logger.error(f"Scenario with ID {scenario['id']} already exists")
-        return False
+        new_ids.add(scenario['id'])
     
     # Add version and timestamp
-    scenario['version'] = '1.0'
-    scenario['last_updated'] = datetime.now().isoformat()
+    now = datetime.now().isoformat()
+    for scenario in scenarios:
+        scenario['version'] = '1.0'
+        scenario['last_updated'] = now
+        _scenarios.append(scenario)
+        logger.info(f"Added new scenario: {scenario['id']} - {scenario['title']}")
     
-    _scenarios.append(scenario)
-    logger.info(f"Added new scenario: {scenario['id']} - {scenario['title']}")
+    _rebuild_indexes()
     
     # Save the updated scenarios
     return save_scenarios()
@@ -243,28 +302,30 @@ def update_scenario(scenario_id: str, updates: Dict[str, Any]) -> bool:
     """
     global _scenarios
     
-    for i, scenario in enumerate(_scenarios):
-        if scenario.get('id') == scenario_id:
-            # Update version
-            current_version = scenario.get('version', '1.0')
-            try:
-                major, minor = current_version.split('.')
-                new_version = f"{major}.{int(minor) + 1}"
-            except ValueError:
-                new_version = '1.1'
-            
-            # Apply updates
-            _scenarios[i].update(updates)
-            _scenarios[i]['version'] = new_version
-            _scenarios[i]['last_updated'] = datetime.now().isoformat()
-            
-            logger.info(f"Updated scenario {scenario_id} to version {new_version}")
-            
-            # Save the updated scenarios
-            return save_scenarios()
+    scenario = _scenarios_by_id.get(scenario_id)
+    if scenario is None:
+        logger.warning(f"Scenario with ID {scenario_id} not found for update")
+        return False
     
-    logger.warning(f"Scenario with ID {scenario_id} not found for update")
-    return False
+    # Update version
+    current_version = scenario.get('version', '1.0')
+    try:
+        major, minor = current_version.split('.')
+        new_version = f"{major}.{int(minor) + 1}"
+    except ValueError:
+        new_version = '1.1'
+    
+    # Apply updates
+    scenario.update(updates)
+    scenario['version'] = new_version
+    scenario['last_updated'] = datetime.now().isoformat()
+    
+    # The updates may change the indexed fields (id, difficulty, topics)
+    _rebuild_indexes()
+    logger.info(f"Updated scenario {scenario_id} to version {new_version}")
+    
+    # Save the updated scenarios
+    return save_scenarios()
 
 # Initialize the scenario manager when the module is imported
 initialize_scenario_manager()
\ No newline at end of file
@@ -1,7 +1,8 @@
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, Iterator, List, Any, Optional, Union
 from loguru import logger
 import json
 import os
+import orjson
 import sqlite3
 from datetime import datetime
 import uuid
@@ -242,7 +243,7 @@ def store_evaluation(session_id: str, evaluation_type: str, evaluation_data: Dic
                 evaluation_id,
                 session_id,
                 evaluation_type,
-                json.dumps(evaluation_data),
+                orjson.dumps(evaluation_data).decode(),
                 timestamp
             )
         )
@@ -284,7 +285,7 @@ def store_report(session_id: str, report_data: Dict[str, Any]) -> str:
             (
                 report_id,
                 session_id,
-                json.dumps(report_data),
+                orjson.dumps(report_data).decode(),
                 timestamp
             )
         )
@@ -400,7 +401,7 @@ def get_session_evaluations(session_id: str) -> List[Dict[str, Any]]:
         for row in rows:
             evaluation = dict(row)
             if evaluation.get("evaluation_data"):
-                evaluation["evaluation_data"] = json.loads(evaluation["evaluation_data"])
+                evaluation["evaluation_data"] = orjson.loads(evaluation["evaluation_data"])
             evaluations.append(evaluation)
         
         # Close connection
@@ -440,7 +441,7 @@ def get_session_report(session_id: str) -> Optional[Dict[str, Any]]:
         # Convert row to dict and parse report data
         report = dict(row)
         if report.get("report_data"):
-            report["report_data"] = json.loads(report["report_data"])
+            report["report_data"] = orjson.loads(report["report_data"])
         
         # Close connection
         conn.close()
@@ -600,5 +601,68 @@ def export_session_to_json(session_id: str, output_path: Optional[str] = None) -
         logger.error(f"Error exporting session: {str(e)}")
         raise
 
+def iter_session_records(session_id: str) -> Iterator[Dict[str, Any]]:
+    """
+    Yield a session's data one record at a time: the session itself, each response,
+    each evaluation and the latest report, each tagged with its record type.
+    
+    Rows are read from the database cursor as they are yielded, so the whole
+    transcript is never held in memory at once.
+    
+    Args:
+        session_id: The session ID
+        
+    Returns:
+        Iterator over the session records
+    """
+    global _db_path
+    
+    session = get_session(session_id)
+    if not session:
+        logger.warning(f"Session {session_id} not found")
+        return
+    yield {"type": "session", **session}
+    
+    conn = sqlite3.connect(_db_path)
+    conn.row_factory = sqlite3.Row
+    try:
+        for row in conn.execute("SELECT * FROM responses WHERE session_id = ? ORDER BY timestamp", (session_id,)):
+            yield {"type": "response", **dict(row)}
+        
+        for row in conn.execute("SELECT * FROM evaluations WHERE session_id = ? ORDER BY timestamp", (session_id,)):
+            evaluation = dict(row)
+            if evaluation.get("evaluation_data"):
+                evaluation["evaluation_data"] = orjson.loads(evaluation["evaluation_data"])
+            yield {"type": "evaluation", **evaluation}
+    finally:
+        conn.close()
+    
+    report = get_session_report(session_id)
+    if report:
+        yield {"type": "report", **report["report_data"]}
+
+def export_session_to_ndjson(session_id: str, output_path: str) -> str:
+    """
+    Export a session to a newline-delimited JSON file, one record per line.
+    
+    Args:
+        session_id: The session ID
+        output_path: Path of the file to write
+        
+    Returns:
+        Path to the exported file
+    """
+    try:
+        with open(output_path, "wb") as f:
+            for record in iter_session_records(session_id):
+                f.write(orjson.dumps(record, default=str))
+                f.write(b"\n")
+        
+        logger.info(f"Exported session {session_id} to {output_path}")
+        return output_path
+    except Exception as e:
+        logger.error(f"Error exporting session: {str(e)}")
+        raise
+
 # Initialize the storage system when the module is imported
 initialize_storage_system()
\ No newline at end of file
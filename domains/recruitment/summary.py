@@ -1,15 +1,18 @@
 from domains.utils import get_chat_llm
 
+import re
 from typing import List, Literal
 
+import numpy as np
+
 from langchain_core.documents import Document
 from langchain_core.output_parsers import StrOutputParser
 
 from langgraph.graph import StateGraph, START, END
-from langgraph.constants import Send
 
 from domains.recruitment.utils import get_attribute
-from domains.stategraph import OverallState, SummaryState
+from domains.recruitment._kernels import nanmean_scores
+from domains.stategraph import OverallState, SCORE_COLUMNS
 from domains.settings import config_settings
 
 from langchain.chains.combine_documents.reduce import (
@@ -22,32 +25,61 @@ from domains.recruitment.prompts import (
 )
 
 
+# Section labels of the summary map prompt holding each SCORE_COLUMNS rating
+_SCORE_LABELS = ("Confidence Level", "Directness", "Completeness", "Professional Language", "Clarity & Structure")
+_SCORE_COLUMN_BY_LABEL = {label.lower(): i for i, label in enumerate(_SCORE_LABELS)}
+
+# A rating label followed, on the same line, by the first number after it
+_SCORE_RE = re.compile(
+    r"(" + "|".join(re.escape(label) for label in _SCORE_LABELS) + r")[^0-9\n]{0,40}(\d+)",
+    re.IGNORECASE
+)
+
+
+def extract_scores(summary: str) -> List[float]:
+    """Read the 1-10 ratings from a Q&A summary, in SCORE_COLUMNS order, NaN where missing."""
+    row = [np.nan] * len(SCORE_COLUMNS)
+    for label, value in _SCORE_RE.findall(summary):
+        i = _SCORE_COLUMN_BY_LABEL[label.lower()]
+        if np.isnan(row[i]):
+            row[i] = float(value)
+    return row
+
+
+def format_score_averages(scores: np.ndarray) -> str:
+    """Average each score column over the summaries that rated it and format the result for the reduce prompt."""
+    lines = []
+    for label, mean in zip(_SCORE_LABELS, nanmean_scores(scores).tolist()):
+        lines.append(f"- {label}: Not available" if np.isnan(mean) else f"- {label}: {mean:.1f}/10")
+    return "\n".join(lines)
+
+
 def create_summarization_graph():
     llm = get_chat_llm()
 
-    map_prompt = initialize_summary_map_prompt() | llm | StrOutputParser()
-    map_chain = map_prompt | llm | StrOutputParser()
+    map_chain = initialize_summary_map_prompt() | llm | StrOutputParser()
 
     reduce_chain = initialize_reduce_prompt() | llm | StrOutputParser()
 
     def length_function(documents: List[Document]) -> int:
         return sum(llm.get_num_tokens(doc.page_content) for doc in documents)
 
-    async def generate_summary(state: SummaryState):
-        content = get_attribute(state, "content", "")
-        response = await map_chain.ainvoke({"context": content})
-        return {"summaries": [response]}
-
-    def map_summaries(state: OverallState):
+    async def generate_summaries(state: OverallState):
+        # Summarize every Q&A in one batched call, bounded by the concurrency limit
         contents = get_attribute(state, "contents", [])
-        return [
-            Send("generate_summary", {"content": content}) for content in contents
-        ]
+        responses = await map_chain.abatch(
+            [{"document": content} for content in contents],
+            {"max_concurrency": config_settings.CONCURRENCY_LIMIT},
+        )
+        return {"summaries": responses}
 
     def collect_summaries(state: OverallState):
         summaries = get_attribute(state, "summaries", [])
+        # Keep the ratings as one column per score so they are averaged numerically
+        scores = np.array([extract_scores(summary) for summary in summaries], dtype=np.float32)
         return {
-            "collapsed_summaries": [Document(page_content=summary) for summary in summaries]
+            "collapsed_summaries": [Document(page_content=summary) for summary in summaries],
+            "scores": scores.reshape(-1, len(SCORE_COLUMNS))
         }
 
     async def collapse_summaries(state: OverallState):
@@ -74,19 +106,23 @@ def create_summarization_graph():
     async def generate_final_summary(state: OverallState):
         collapsed_summaries = get_attribute(state, "collapsed_summaries", [])
         docs_text = "\n\n".join([doc.page_content for doc in collapsed_summaries])
-        response = await reduce_chain.ainvoke({"docs": docs_text})
+        scores = get_attribute(state, "scores")
+        inputs = {"document": docs_text}
+        if scores is not None:
+            inputs["score_averages"] = format_score_averages(scores)
+        response = await reduce_chain.ainvoke(inputs)
         return {"final_summary": response}
 
     # Nodes:
     graph = StateGraph(OverallState)
-    graph.add_node("generate_summary", generate_summary)
+    graph.add_node("generate_summaries", generate_summaries)
     graph.add_node("collect_summaries", collect_summaries)
     graph.add_node("collapse_summaries", collapse_summaries)
     graph.add_node("generate_final_summary", generate_final_summary)
 
     # Edges:
-    graph.add_conditional_edges(START, map_summaries, ["generate_summary"])
-    graph.add_edge("generate_summary", "collect_summaries")
+    graph.add_edge(START, "generate_summaries")
+    graph.add_edge("generate_summaries", "collect_summaries")
     graph.add_conditional_edges("collect_summaries", should_collapse)
     graph.add_conditional_edges("collapse_summaries", should_collapse)
     graph.add_edge("generate_final_summary", END)
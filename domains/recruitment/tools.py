@@ -1,13 +1,25 @@
+import asyncio
+from functools import lru_cache
+import orjson
 from loguru import logger
-from typing import Dict, Any, Callable, List, Optional
-from langchain_core.output_parsers import StrOutputParser
+from hashlib import blake2b
+from typing import Dict, Any, Callable, List, Optional, Union
+from langchain_core.exceptions import OutputParserException
+from langchain_core.output_parsers import PydanticOutputParser, StrOutputParser
 from langchain.prompts import PromptTemplate
 
-from domains.utils import get_chat_llm
-from domains.recruitment.utils import get_attribute
-from domains.stategraph import OverallState, InterviewAnalysisState
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+from domains.settings import config_settings
+from domains.utils import get_chat_llm, get_structured_llm
+from domains.recruitment.utils import get_attribute, set_attribute
+from domains.stategraph import InterviewAnalysisState, InterviewAnalysisStateFast
 from domains.recruitment.summary import create_summarization_graph
 from domains.recruitment.prompts import (
+    ValidationReport,
     initialize_validation_prompt,
     initialize_grammar_check_prompt
 )
@@ -15,6 +27,60 @@ from domains.recruitment.prompts import (
 # Dictionary to store all available tools
 TOOLS_REGISTRY = {}
 
+# In-process cache of tool LLM results, keyed by a hash of the prompt name and input text.
+# Oldest entries are evicted first once the cache is full.
+_RESPONSE_CACHE: Dict[str, str] = {}
+_RESPONSE_CACHE_SIZE = 256
+
+# Bounds how many summarization graphs run at once, so a batch of interviews does not
+# flood the LLM provider with more requests than its connection pool can serve
+_summarization_semaphore = asyncio.Semaphore(config_settings.CONCURRENCY_LIMIT)
+
+def _response_cache_key(prompt_name: str, text: str) -> str:
+    """Build the response cache key for a prompt applied to a text."""
+    return blake2b(f"{prompt_name}|{text}".encode("utf-8"), digest_size=16).hexdigest()
+
+def _cache_response(key: str, result: str) -> None:
+    """Store a tool LLM result in the response cache."""
+    if len(_RESPONSE_CACHE) >= _RESPONSE_CACHE_SIZE:
+        _RESPONSE_CACHE.pop(next(iter(_RESPONSE_CACHE)))
+    _RESPONSE_CACHE[key] = result
+
+@lru_cache(maxsize=1)
+def _summary_cache():
+    """Open the on-disk interview summary cache, or return None when it is disabled or diskcache is not installed."""
+    if diskcache is None or not config_settings.SUMMARY_CACHE_PATH:
+        return None
+    try:
+        return diskcache.Cache(config_settings.SUMMARY_CACHE_PATH)
+    except Exception as e:
+        logger.error(f"Error opening interview summary cache: {str(e)}")
+        return None
+
+@lru_cache(maxsize=1)
+def _grammar_chain():
+    """Build the grammar check chain on first use and reuse it for every call."""
+    return initialize_grammar_check_prompt() | get_chat_llm() | StrOutputParser()
+
+# Parses format-instructed validation JSON (including fenced replies) for models without structured output
+_VALIDATION_PARSER = PydanticOutputParser(pydantic_object=ValidationReport)
+
+@lru_cache(maxsize=1)
+def _validation_chain():
+    """
+    Build the validation chain on first use and reuse it for every call.
+    
+    Returns:
+        Tuple of the chain and whether it returns a ValidationReport natively. Otherwise the
+        chain returns the raw text, so a free-form answer can be kept when it does not parse.
+    """
+    llm = get_chat_llm()
+    structured_llm, native = get_structured_llm(llm, ValidationReport)
+    prompt = initialize_validation_prompt(include_format_instructions=not native)
+    if native:
+        return prompt | structured_llm, True
+    return prompt | llm | StrOutputParser(), False
+
 def register_tool(name: str, description: str = None):
     """
     Decorator to register a tool in the tools registry.
@@ -71,8 +137,8 @@ def get_tools_dict() -> Dict[str, Callable]:
     description="Summarizes the interview history and generates a comprehensive evaluation"
 )
 async def summarize_interview_history(
-        state: InterviewAnalysisState,
-) -> InterviewAnalysisState:
+        state: Union[InterviewAnalysisState, InterviewAnalysisStateFast],
+) -> Union[InterviewAnalysisState, InterviewAnalysisStateFast]:
     """
     Summarize the interview history and generate a comprehensive evaluation.
     
@@ -82,37 +148,40 @@ async def summarize_interview_history(
     Returns:
         Updated state with the final summary
     """
-    interview_contents = state.get("contents", [])
+    interview_contents = get_attribute(state, "contents", [])
 
     if not interview_contents:
         logger.warning("No interview contents found for summarization.")
         raise ValueError("No interview contents found for summarization.")
 
-    summary_state = OverallState(
-        contents=interview_contents,
-        summaries=[],
-        collapsed_summaries=[],
-        final_summary="",
-    )
+    # Identical transcripts are served from the persistent summary cache
+    summary_cache = _summary_cache()
+    cache_key = _response_cache_key("summary", "\0".join(interview_contents))
+    if summary_cache is not None:
+        cached = summary_cache.get(cache_key)
+        if cached is not None:
+            set_attribute(state, "final_summary", cached)
+            logger.success("Interview summary served from cache.")
+            return state
 
-    contents = summary_state.get("contents", [])
     # Create the summarization graph by calling the function
     summarization_graph = create_summarization_graph()
 
     try:
-        final_state = None
-        async for step in summarization_graph.ainvoke(
-                {"contents": contents},
+        async with _summarization_semaphore:
+            final_state = await summarization_graph.ainvoke(
+                {"contents": interview_contents},
                 {"recursion_limit": 10},
-        ):
-            final_state = step
+            )
 
         if final_state is None:
             logger.error("Summarization graph did not return a final state.")
             raise ValueError("Summarization failed: No final state returned.")
 
         final_summary = get_attribute(final_state, "final_summary")
-        state["final_summary"] = final_summary
+        set_attribute(state, "final_summary", final_summary)
+        if summary_cache is not None and final_summary:
+            summary_cache.set(cache_key, final_summary, expire=config_settings.SUMMARY_CACHE_TTL)
 
     except Exception as e:
         logger.error(f"Error running summarization graph: {str(e)}")
@@ -125,7 +194,7 @@ async def summarize_interview_history(
     description="Checks grammar and spelling in the interview summary"
 )
 def grammar_check(
-        state: InterviewAnalysisState,
+        state: Union[InterviewAnalysisState, InterviewAnalysisStateFast],
 ) -> str:
     """
     Check grammar and spelling in the interview summary.
@@ -139,16 +208,19 @@ def grammar_check(
     final_summary = get_attribute(state, "final_summary")
 
     try:
-        llm = get_chat_llm()
-        grammar_prompt = initialize_grammar_check_prompt()
+        cache_key = _response_cache_key("grammar_check", final_summary)
+        cached = _RESPONSE_CACHE.get(cache_key)
+        if cached is not None:
+            logger.success("Grammar check served from cache.")
+            return cached
         
-        chain = grammar_prompt | llm | StrOutputParser()
-        response = chain.invoke({"text": final_summary})
+        response = _grammar_chain().invoke({"text": final_summary})
 
         if hasattr(response, 'content'):
             result = response.content.strip()
         else:
             result = str(response).strip()
+        _cache_response(cache_key, result)
         logger.success("Grammar check completed.")
         return result
     except Exception as e:
@@ -160,8 +232,8 @@ def grammar_check(
     description="Validates the quality and completeness of the assessment report"
 )
 def validation_tool(
-        state: InterviewAnalysisState
-) -> InterviewAnalysisState:
+        state: Union[InterviewAnalysisState, InterviewAnalysisStateFast]
+) -> Union[InterviewAnalysisState, InterviewAnalysisStateFast]:
     """
     Validate the quality and completeness of the assessment report.
     
@@ -173,21 +245,31 @@ def validation_tool(
     """
     try:
         logger.info("Checking assessment report quality and completeness...")
-        validation_prompt = initialize_validation_prompt()
-        llm = get_chat_llm()
-        
         final_summary = get_attribute(state, "final_summary", "")
         
-        chain = validation_prompt | llm | StrOutputParser()
-        response = chain.invoke({"summary": final_summary})
-
-        if hasattr(response, 'content'):
-            validation_result = response.content.strip()
+        cache_key = _response_cache_key("validation", final_summary)
+        cached = _RESPONSE_CACHE.get(cache_key)
+        if cached is not None:
+            set_attribute(state, "validation_result", cached)
+            logger.success("Validation served from cache.")
+            return state
+        
+        chain, native = _validation_chain()
+        output = chain.invoke({"summary": final_summary})
+        if native:
+            validation_result = orjson.dumps(output.model_dump(), option=orjson.OPT_INDENT_2).decode()
         else:
-            validation_result = str(response).strip()
+            validation_result = output.strip()
+            try:
+                # Normalize well-formed validation JSON; free-form answers are kept as they are
+                report = _VALIDATION_PARSER.parse(validation_result)
+                validation_result = orjson.dumps(report.model_dump(), option=orjson.OPT_INDENT_2).decode()
+            except OutputParserException as e:
+                logger.warning(f"Validation output is not the expected JSON, keeping raw text: {str(e)}")
+        _cache_response(cache_key, validation_result)
             
         # Store validation result in state
-        state["validation_result"] = validation_result
+        set_attribute(state, "validation_result", validation_result)
         logger.success("Validation completed successfully.")
         
         return state
@@ -201,7 +283,7 @@ def validation_tool(
     description="Evaluates the technical accuracy of the candidate's responses"
 )
 def technical_accuracy_check(
-        state: InterviewAnalysisState
+        state: Union[InterviewAnalysisState, InterviewAnalysisStateFast]
 ) -> Dict[str, Any]:
     """
     Evaluate the technical accuracy of the candidate's responses.
@@ -217,15 +299,13 @@ def technical_accuracy_check(
         llm = get_chat_llm()
         
         # Extract technical content from the interview
-        contents = state.get("contents", [])
+        contents = get_attribute(state, "contents", [])
         technical_content = "\n".join(contents)
         
         # Create a prompt for technical evaluation
         prompt = PromptTemplate(
             template="""
-            Analyze the following technical interview responses for accuracy and correctness:
-            
-            {content}
+            Analyze the technical interview responses given at the end of this message for accuracy and correctness.
             
             Provide a detailed evaluation of the technical accuracy, including:
             1. Overall technical accuracy score (1-10)
@@ -234,13 +314,16 @@ def technical_accuracy_check(
             4. Evaluation of problem-solving approach
             
             Format your response as a JSON object with the following structure:
-            {
+            {{
                 "technical_accuracy_score": int,
                 "misconceptions": [list of strings],
                 "knowledge_depth_score": int,
                 "problem_solving_score": int,
                 "overall_assessment": string
-            }
+            }}
+            
+            RESPONSES:
+            {content}
             """,
             input_variables=["content"]
         )
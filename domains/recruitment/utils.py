@@ -2,9 +2,22 @@ from typing import Any, Optional, TypeVar
 
 T = TypeVar('T')
 
+_MISSING = object()
+
 def get_attribute(obj: Any, attr_name: str, default: Optional[T] = None) -> T:
-    if hasattr(obj, attr_name):
-        return getattr(obj, attr_name)
-    elif isinstance(obj, dict) and attr_name in obj:
-        return obj[attr_name]
-    return default
\ No newline at end of file
+    # Graph states are TypedDicts, i.e. plain dicts at runtime, so check the dict case first
+    if isinstance(obj, dict):
+        value = obj.get(attr_name, _MISSING)
+        if value is not _MISSING:
+            return value
+    value = getattr(obj, attr_name, _MISSING)
+    if value is not _MISSING:
+        return value
+    return default
+
+def set_attribute(obj: Any, attr_name: str, value: Any) -> None:
+    # Counterpart of get_attribute for states that are either dicts or slotted dataclasses
+    if isinstance(obj, dict):
+        obj[attr_name] = value
+    else:
+        setattr(obj, attr_name, value)
@@ -1,8 +1,10 @@
 import os
+import sys
 
 from pydantic_settings import BaseSettings
 from pydantic import ConfigDict
-from typing import ClassVar, Dict
+from functools import cached_property
+from typing import Dict
 from enum import Enum
 
 
@@ -17,6 +19,15 @@ class LLMService(str, Enum):
     AWS = "aws-bedrock"
 
 
+# Default model for every Bedrock model setting
+_DEFAULT_BEDROCK_MODEL_ARN = "arn:aws:bedrock:us-east-1:688427729924:inference-profile/us.meta.llama3-3-70b-instruct-v1:0"
+
+
+def _interned_env(name: str, default: str) -> str:
+    """Read an environment variable as an interned string, so repeated model IDs share one object."""
+    return sys.intern(os.environ.get(name, default))
+
+
 class Settings(BaseSettings):
     OPENAI_API_KEY: str = os.environ.get("OPENAI_API_KEY", "")
     GEMINI_API_KEY: str = os.environ.get("GEMINI_API_KEY", "")
@@ -42,6 +53,26 @@ class Settings(BaseSettings):
         "Detailed explanation with direct evidence from the transcript that justifies the compliance determination."
     )
 
+    # Evaluation Cache Settings
+    EVALUATION_CACHE_THRESHOLD: float = float(os.environ.get("EVALUATION_CACHE_THRESHOLD", "0.93"))
+    EVALUATION_CACHE_SIZE: int = int(os.environ.get("EVALUATION_CACHE_SIZE", 1024))
+
+    # LLM Response Cache Settings (empty path disables the cache)
+    LLM_CACHE_PATH: str = os.environ.get(
+        "LLM_CACHE_PATH",
+        os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "llm_cache.db")
+    )
+
+    # Interview Summary Cache Settings (empty path disables the cache, TTL in seconds)
+    SUMMARY_CACHE_PATH: str = os.environ.get(
+        "SUMMARY_CACHE_PATH",
+        os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "summary_cache")
+    )
+    SUMMARY_CACHE_TTL: int = int(os.environ.get("SUMMARY_CACHE_TTL", 7 * 24 * 60 * 60))
+
+    # Number of most recent conversation messages shown when selecting the next question
+    NEXT_QUESTION_HISTORY_MESSAGES: int = int(os.environ.get("NEXT_QUESTION_HISTORY_MESSAGES", 8))
+
     # Semaphore Settings
     CONCURRENCY_LIMIT: int = int(os.environ.get("CONCURRENCY_LIMIT", 10))
 
@@ -79,129 +110,115 @@ class Settings(BaseSettings):
         LLMService.AWS.value
     )
 
-    # LLM Model Configurations
-    LLMS: ClassVar[Dict[str, str]] = {
-        "CHAT_MODEL_NAME": os.environ.get("CHAT_MODEL_NAME", "gpt-4o-mini"),
-        "EMBEDDING_MODEL_NAME": os.environ.get(
-            "EMBEDDING_MODEL_NAME",
-            "text-embedding-3-small"
-        ),
-        "CHAT_MODEL_STREAMING_NAME": os.environ.get(
-            "CHAT_MODEL_STREAMING_NAME",
-            "gpt-4o-mini"
-        ),
-        "SUMMARIZE_MODEL_NAME": os.environ.get("SUMMARIZE_MODEL_NAME", "gpt-4o-mini"),
-        "TRANSFORM_QUERY_MODEL_NAME": os.environ.get(
-            "TRANSFORM_QUERY_MODEL_NAME",
-            "gpt-4o-mini"
-        )
-    }
-
-    OLLAMA_MODEL_SETTINGS: ClassVar[Dict[str, str]] = {
-        "CHAT_MODEL_NAME": os.environ.get("CHAT_MODEL_NAME", "qwen2.5:14b"),
-        "EMBEDDING_MODEL_NAME": os.environ.get(
-            "EMBEDDING_MODEL_NAME",
-            "nomic-embed-text:latest"
-        ),
-        "CHAT_MODEL_STREAMING_NAME": os.environ.get(
-            "CHAT_MODEL_STREAMING_NAME",
-            "qwen2.5:14b"
-        ),
-        "SUMMARIZE_MODEL_NAME": os.environ.get("SUMMARIZE_MODEL_NAME", "qwen2.5:14b"),
-        "TRANSFORM_QUERY_MODEL_NAME": os.environ.get(
-            "TRANSFORM_QUERY_MODEL_NAME",
-            "qwen2.5:14b"
-        )
-    }
-
-    GEMINI_MODEL_SETTINGS: ClassVar[Dict[str, str]] = {
-        "CHAT_MODEL_NAME": os.environ.get("CHAT_MODEL_NAME", "gemini-1.5-pro"),
-        "EMBEDDING_MODEL_NAME": os.environ.get(
-            "EMBEDDING_MODEL_NAME",
-            "models/embedding-001"
-        ),
-        "CHAT_MODEL_STREAMING_NAME": os.environ.get(
-            "CHAT_MODEL_STREAMING_NAME",
-            "gemini-1.5-pro"
-        ),
-        "SUMMARIZE_MODEL_NAME": os.environ.get("SUMMARIZE_MODEL_NAME", "gemini-1.5-pro"),
-        "TRANSFORM_QUERY_MODEL_NAME": os.environ.get(
-            "TRANSFORM_QUERY_MODEL_NAME",
-            "gemini-1.5-pro"
-        )
-    }
-
-    GROQ_SETTINGS: ClassVar[Dict[str, str]] = {
-        "CHAT_MODEL_NAME": os.environ.get("CHAT_MODEL_NAME", "llama3-70b-8192"),
-        "EMBEDDING_MODEL_NAME": os.environ.get(
-            "EMBEDDING_MODEL_NAME",
-            "llama3-embedding-v1"
-        ),
-        "CHAT_MODEL_STREAMING_NAME": os.environ.get(
-            "CHAT_MODEL_STREAMING_NAME",
-            "llama3-70b-8192"
-        ),
-        "SUMMARIZE_MODEL_NAME": os.environ.get("SUMMARIZE_MODEL_NAME", "llama3-70b-8192"),
-        "TRANSFORM_QUERY_MODEL_NAME": os.environ.get(
-            "TRANSFORM_QUERY_MODEL_NAME",
-            "llama3-70b-8192"
-        )
-    }
-
-    AWS_BEDROCK_MODEL_PROVIDERS: ClassVar[dict] = {
-        "CHAT_MODEL_NAME": os.environ.get("CHAT_MODEL_PROVIDER", "meta"),
-        "EMBEDDING_MODEL_NAME": os.environ.get("EMBEDDING_MODEL_PROVIDER", "amazon"),
-        "LLM_MODEL_NAME": os.environ.get("LLM_MODEL_PROVIDER", "meta"),
-        "CLASSIFICATION_MODEL_NAME": os.environ.get("CLASSIFICATION_MODEL_PROVIDER", "meta"),
-        "TABLE_SUMMARIZER_MODEL": os.environ.get("TABLE_SUMMARIZER_PROVIDER", "meta"),
-        "VISION_MODEL": os.environ.get("VISION_MODEL_PROVIDER", "meta"),
-        "OPTIMIZED_QUESTION_MODEL": os.environ.get("OPTIMIZED_QUESTION_PROVIDER", "meta"),
-        "LANGUAGE_DETECTION_MODEL": os.environ.get("LANGUAGE_DETECTION_PROVIDER", "meta"),
-        "CHAT_STREAMING_MODEL": os.environ.get("CHAT_STREAMING_PROVIDER", "meta"),
-        "TRANSFORM_QUERY_MODEL_NAME": os.environ.get("TRANSFORM_QUERY_MODEL_NAME", "meta")
-    }
-
-    AWS_BEDROCK_MODEL_SETTINGS: ClassVar[dict] = {
-        "CHAT_MODEL_NAME": os.environ.get(
-            "CHAT_MODEL_NAME",
-            "arn:aws:bedrock:us-east-1:688427729924:inference-profile/us.meta.llama3-3-70b-instruct-v1:0"
-        ),
-        "EMBEDDING_MODEL_NAME": os.environ.get(
-            "EMBEDDING_MODEL_NAME", "amazon.titan-embed-text-v2:0"
-        ),
-        "LLM_MODEL_NAME": os.environ.get(
-            "LLM_MODEL_NAME",
-            "arn:aws:bedrock:us-east-1:688427729924:inference-profile/us.meta.llama3-3-70b-instruct-v1:0"
-        ),
-        "CLASSIFICATION_MODEL_NAME": os.environ.get(
-            "CLASSIFICATION_MODEL_NAME",
-            "arn:aws:bedrock:us-east-1:688427729924:inference-profile/us.meta.llama3-3-70b-instruct-v1:0"
-        ),
-        "TABLE_SUMMARIZER_MODEL": os.environ.get(
-            "TABLE_SUMMARIZER_MODEL",
-            "arn:aws:bedrock:us-east-1:688427729924:inference-profile/us.meta.llama3-3-70b-instruct-v1:0"
-        ),
-        "VISION_MODEL": os.environ.get(
-            "VISION_MODEL",
-            "arn:aws:bedrock:us-east-1:688427729924:inference-profile/us.meta.llama3-3-70b-instruct-v1:0"
-        ),
-        "OPTIMIZED_QUESTION_MODEL": os.environ.get(
-            "OPTIMIZED_QUESTION_MODEL",
-            "arn:aws:bedrock:us-east-1:688427729924:inference-profile/us.meta.llama3-3-70b-instruct-v1:0"
-        ),
-        "LANGUAGE_DETECTION_MODEL": os.environ.get(
-            "LANGUAGE_DETECTION_MODEL",
-            "arn:aws:bedrock:us-east-1:688427729924:inference-profile/us.meta.llama3-3-70b-instruct-v1:0"
-        ),
-        "CHAT_STREAMING_MODEL": os.environ.get(
-            "CHAT_STREAMING_MODEL",
-            "arn:aws:bedrock:us-east-1:688427729924:inference-profile/us.meta.llama3-3-70b-instruct-v1:0"
-        ),
-        "TRANSFORM_QUERY_MODEL_NAME": os.environ.get(
-            "TRANSFORM_QUERY_MODEL_NAME",
-            "arn:aws:bedrock:us-east-1:688427729924:inference-profile/us.meta.llama3-3-70b-instruct-v1:0"
-        )
-    }
+    # LLM Model Configurations (read from the environment on first access, so only the
+    # provider actually in use is resolved)
+    @cached_property
+    def LLMS(self) -> Dict[str, str]:
+        return {
+            "CHAT_MODEL_NAME": os.environ.get("CHAT_MODEL_NAME", "gpt-4o-mini"),
+            "EMBEDDING_MODEL_NAME": os.environ.get(
+                "EMBEDDING_MODEL_NAME",
+                "text-embedding-3-small"
+            ),
+            "CHAT_MODEL_STREAMING_NAME": os.environ.get(
+                "CHAT_MODEL_STREAMING_NAME",
+                "gpt-4o-mini"
+            ),
+            "SUMMARIZE_MODEL_NAME": os.environ.get("SUMMARIZE_MODEL_NAME", "gpt-4o-mini"),
+            "TRANSFORM_QUERY_MODEL_NAME": os.environ.get(
+                "TRANSFORM_QUERY_MODEL_NAME",
+                "gpt-4o-mini"
+            )
+        }
+
+    @cached_property
+    def OLLAMA_MODEL_SETTINGS(self) -> Dict[str, str]:
+        return {
+            "CHAT_MODEL_NAME": os.environ.get("CHAT_MODEL_NAME", "qwen2.5:14b"),
+            "EMBEDDING_MODEL_NAME": os.environ.get(
+                "EMBEDDING_MODEL_NAME",
+                "nomic-embed-text:latest"
+            ),
+            "CHAT_MODEL_STREAMING_NAME": os.environ.get(
+                "CHAT_MODEL_STREAMING_NAME",
+                "qwen2.5:14b"
+            ),
+            "SUMMARIZE_MODEL_NAME": os.environ.get("SUMMARIZE_MODEL_NAME", "qwen2.5:14b"),
+            "TRANSFORM_QUERY_MODEL_NAME": os.environ.get(
+                "TRANSFORM_QUERY_MODEL_NAME",
+                "qwen2.5:14b"
+            )
+        }
+
+    @cached_property
+    def GEMINI_MODEL_SETTINGS(self) -> Dict[str, str]:
+        return {
+            "CHAT_MODEL_NAME": os.environ.get("CHAT_MODEL_NAME", "gemini-1.5-pro"),
+            "EMBEDDING_MODEL_NAME": os.environ.get(
+                "EMBEDDING_MODEL_NAME",
+                "models/embedding-001"
+            ),
+            "CHAT_MODEL_STREAMING_NAME": os.environ.get(
+                "CHAT_MODEL_STREAMING_NAME",
+                "gemini-1.5-pro"
+            ),
+            "SUMMARIZE_MODEL_NAME": os.environ.get("SUMMARIZE_MODEL_NAME", "gemini-1.5-pro"),
+            "TRANSFORM_QUERY_MODEL_NAME": os.environ.get(
+                "TRANSFORM_QUERY_MODEL_NAME",
+                "gemini-1.5-pro"
+            )
+        }
+
+    @cached_property
+    def GROQ_SETTINGS(self) -> Dict[str, str]:
+        return {
+            "CHAT_MODEL_NAME": os.environ.get("CHAT_MODEL_NAME", "llama3-70b-8192"),
+            "EMBEDDING_MODEL_NAME": os.environ.get(
+                "EMBEDDING_MODEL_NAME",
+                "llama3-embedding-v1"
+            ),
+            "CHAT_MODEL_STREAMING_NAME": os.environ.get(
+                "CHAT_MODEL_STREAMING_NAME",
+                "llama3-70b-8192"
+            ),
+            "SUMMARIZE_MODEL_NAME": os.environ.get("SUMMARIZE_MODEL_NAME", "llama3-70b-8192"),
+            "TRANSFORM_QUERY_MODEL_NAME": os.environ.get(
+                "TRANSFORM_QUERY_MODEL_NAME",
+                "llama3-70b-8192"
+            )
+        }
+
+    @cached_property
+    def AWS_BEDROCK_MODEL_PROVIDERS(self) -> Dict[str, str]:
+        return {
+            "CHAT_MODEL_NAME": _interned_env("CHAT_MODEL_PROVIDER", "meta"),
+            "EMBEDDING_MODEL_NAME": _interned_env("EMBEDDING_MODEL_PROVIDER", "amazon"),
+            "LLM_MODEL_NAME": _interned_env("LLM_MODEL_PROVIDER", "meta"),
+            "CLASSIFICATION_MODEL_NAME": _interned_env("CLASSIFICATION_MODEL_PROVIDER", "meta"),
+            "TABLE_SUMMARIZER_MODEL": _interned_env("TABLE_SUMMARIZER_PROVIDER", "meta"),
+            "VISION_MODEL": _interned_env("VISION_MODEL_PROVIDER", "meta"),
+            "OPTIMIZED_QUESTION_MODEL": _interned_env("OPTIMIZED_QUESTION_PROVIDER", "meta"),
+            "LANGUAGE_DETECTION_MODEL": _interned_env("LANGUAGE_DETECTION_PROVIDER", "meta"),
+            "CHAT_STREAMING_MODEL": _interned_env("CHAT_STREAMING_PROVIDER", "meta"),
+            "TRANSFORM_QUERY_MODEL_NAME": _interned_env("TRANSFORM_QUERY_MODEL_NAME", "meta")
+        }
+
+    @cached_property
+    def AWS_BEDROCK_MODEL_SETTINGS(self) -> Dict[str, str]:
+        return {
+            "CHAT_MODEL_NAME": _interned_env("CHAT_MODEL_NAME", _DEFAULT_BEDROCK_MODEL_ARN),
+            "EMBEDDING_MODEL_NAME": _interned_env(
+                "EMBEDDING_MODEL_NAME", "amazon.titan-embed-text-v2:0"
+            ),
+            "LLM_MODEL_NAME": _interned_env("LLM_MODEL_NAME", _DEFAULT_BEDROCK_MODEL_ARN),
+            "CLASSIFICATION_MODEL_NAME": _interned_env("CLASSIFICATION_MODEL_NAME", _DEFAULT_BEDROCK_MODEL_ARN),
+            "TABLE_SUMMARIZER_MODEL": _interned_env("TABLE_SUMMARIZER_MODEL", _DEFAULT_BEDROCK_MODEL_ARN),
+            "VISION_MODEL": _interned_env("VISION_MODEL", _DEFAULT_BEDROCK_MODEL_ARN),
+            "OPTIMIZED_QUESTION_MODEL": _interned_env("OPTIMIZED_QUESTION_MODEL", _DEFAULT_BEDROCK_MODEL_ARN),
+            "LANGUAGE_DETECTION_MODEL": _interned_env("LANGUAGE_DETECTION_MODEL", _DEFAULT_BEDROCK_MODEL_ARN),
+            "CHAT_STREAMING_MODEL": _interned_env("CHAT_STREAMING_MODEL", _DEFAULT_BEDROCK_MODEL_ARN),
+            "TRANSFORM_QUERY_MODEL_NAME": _interned_env("TRANSFORM_QUERY_MODEL_NAME", _DEFAULT_BEDROCK_MODEL_ARN)
+        }
 
     def validate_api_keys(self) -> None:
         """Validate required API keys are present"""
@@ -241,6 +258,5 @@ class Settings(BaseSettings):
 
 try:
     config_settings = Settings()
-    config_settings.validate_vector_db_config()
 except Exception as e:
     raise RuntimeError(f"Failed to initialize application settings: {str(e)}")
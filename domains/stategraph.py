@@ -1,5 +1,7 @@
 import operator
-from typing import Annotated, List, TypedDict, Callable, Any, Union, Literal
+from dataclasses import dataclass, field
+from typing import Annotated, List, Optional, TypedDict, Callable, Any, Union, Literal
+import numpy as np
 from langchain_core.documents import Document
 from langchain_core.messages import BaseMessage
 
@@ -20,9 +22,15 @@ def add_messages(existing_messages: List[BaseMessage], new_messages: List[BaseMe
 IsLastStep = bool
 
 
+# Columns of OverallState.scores: the 1-10 ratings given in each Q&A summary
+SCORE_COLUMNS = ("confidence", "directness", "completeness", "professional_language", "clarity")
+
+
 class OverallState(TypedDict):
     contents: List[str]
     summaries: Annotated[list, operator.add]
+    # (summaries x SCORE_COLUMNS) float array, NaN where a rating is missing
+    scores: np.ndarray
     collapsed_summaries: List[Document]
     final_summary: str
 
@@ -44,4 +52,26 @@ class InterviewAnalysisState(TypedDict):
     vocabulary_score_evaluation: int
     sentence_structure_score: int
     professional_tone_score: int
-    overall_language_score: int
\ No newline at end of file
+    overall_language_score: int
+    validation_result: Optional[str]
+
+
+@dataclass(slots=True)
+class InterviewAnalysisStateFast:
+    """
+    Slotted counterpart of InterviewAnalysisState, used when the evaluation tools are run
+    directly rather than through LangGraph, so each state access is an attribute lookup.
+    """
+    question: str = ""
+    answer: str = ""
+    messages: List[BaseMessage] = field(default_factory=list)
+    is_last_step: IsLastStep = False
+    contents: List[str] = field(default_factory=list)
+    final_summary: str = ""
+    grammar_evaluation: List[str] = field(default_factory=list)
+    spelling_mistakes_evaluation: List[str] = field(default_factory=list)
+    vocabulary_score_evaluation: int = 0
+    sentence_structure_score: int = 0
+    professional_tone_score: int = 0
+    overall_language_score: int = 0
+    validation_result: Optional[str] = None
\ No newline at end of file
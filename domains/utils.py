@@ -1,12 +1,60 @@
 import re
+from functools import lru_cache
 from loguru import logger
 
+import boto3
+from botocore.config import Config
+
 from domains.settings import config_settings, LLMService
 
 from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 from langchain_aws.chat_models import ChatBedrock
 from langchain_aws import BedrockEmbeddings
 from langchain_ollama import OllamaEmbeddings, ChatOllama
+from langchain_core.globals import set_llm_cache
+from langchain.output_parsers import PydanticOutputParser
+from langchain_community.cache import SQLiteCache
+
+
+@lru_cache(maxsize=1)
+def initialize_llm_cache():
+    """
+    Serve identical LLM prompts from an on-disk cache shared by all chat models.
+    
+    Called by the app at startup rather than on import, so tests and tools that import
+    this module neither create the cache file nor get a global cache installed. Only the
+    first call has an effect, so it is safe on every Streamlit rerun.
+    """
+    if not config_settings.LLM_CACHE_PATH:
+        logger.info("LLM response cache disabled")
+        return
+    try:
+        set_llm_cache(SQLiteCache(database_path=config_settings.LLM_CACHE_PATH))
+        logger.info(f"LLM response cache enabled at {config_settings.LLM_CACHE_PATH}")
+    except Exception as e:
+        logger.error(f"Error enabling LLM response cache: {e}")
+
+
+
+@lru_cache(maxsize=1)
+def get_bedrock_runtime_client():
+    """
+    Build the Bedrock runtime client shared by every chat model, so concurrent calls
+    reuse kept-alive connections from one bounded pool instead of opening new ones.
+    
+    Returns:
+        The boto3 bedrock-runtime client.
+    """
+    return boto3.client(
+        "bedrock-runtime",
+        region_name=config_settings.AWS_REGION_NAME,
+        aws_access_key_id=config_settings.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=config_settings.AWS_SECRET_ACCESS_KEY,
+        config=Config(
+            max_pool_connections=config_settings.CONCURRENCY_LIMIT,
+            tcp_keepalive=True,
+        ),
+    )
 
 
 def get_chat_llm(
@@ -42,6 +90,7 @@ def get_chat_llm(
                 logger.info(f"Using regular model ID for {model_key}: {model_id}")
                 return ChatBedrock(
                     model=model_id,
+                    client=get_bedrock_runtime_client(),
                     temperature=temperature,
                     aws_access_key_id=config_settings.AWS_ACCESS_KEY_ID,
                     aws_secret_access_key=config_settings.AWS_SECRET_ACCESS_KEY,
@@ -51,6 +100,7 @@ def get_chat_llm(
             return ChatBedrock(
                 model_id=model_id,
                 provider=provider,
+                client=get_bedrock_runtime_client(),
                 temperature=temperature,
                 aws_access_key_id=config_settings.AWS_ACCESS_KEY_ID,
                 aws_secret_access_key=config_settings.AWS_SECRET_ACCESS_KEY,
@@ -59,4 +109,55 @@ def get_chat_llm(
 
     except Exception as e:
         logger.error(f"Error {e}")
-        return None
\ No newline at end of file
+        return None
+
+
+def get_structured_llm(llm, schema, method: str = "json_schema"):
+    """
+    Bind a Pydantic schema to an LLM, using native structured output when the model
+    supports it and parsing format-instructed JSON otherwise.
+    
+    Args:
+        llm: The chat model.
+        schema: The Pydantic model the output should be parsed into.
+        method: Preferred structured output method, for models that let the caller choose.
+    
+    Returns:
+        Tuple of the structured runnable and whether native structured output is used.
+    """
+    try:
+        try:
+            return llm.with_structured_output(schema, method=method), True
+        except TypeError:
+            # The model does not let the caller choose the method
+            return llm.with_structured_output(schema), True
+    except (ValueError, NotImplementedError) as e:
+        logger.info(f"Native structured output unavailable for {schema.__name__}, parsing JSON instead: {e}")
+        return llm | PydanticOutputParser(pydantic_object=schema), False
+
+
+def get_embeddings(
+        model_key: str = "EMBEDDING_MODEL_NAME",
+):
+    try:
+        if config_settings.LLM_SERVICE_TYPE == LLMService.OPENAI.value:
+            return OpenAIEmbeddings(
+                model=config_settings.LLMS.get(model_key, None),
+            )
+
+        elif config_settings.LLM_SERVICE_TYPE == LLMService.OLLAMA.value:
+            return OllamaEmbeddings(
+                model=config_settings.OLLAMA_MODEL_SETTINGS.get(model_key, None),
+            )
+
+        elif config_settings.LLM_SERVICE_TYPE == LLMService.AWS.value:
+            return BedrockEmbeddings(
+                model_id=config_settings.AWS_BEDROCK_MODEL_SETTINGS.get(model_key, None),
+                aws_access_key_id=config_settings.AWS_ACCESS_KEY_ID,
+                aws_secret_access_key=config_settings.AWS_SECRET_ACCESS_KEY,
+                region_name=config_settings.AWS_REGION_NAME,
+            )
+
+    except Exception as e:
+        logger.error(f"Error {e}")
+        return None
@@ -1,16 +1,43 @@
 #!/usr/bin/env python3
 import asyncio
-import json
 import os
 import sys
-import traceback
-from typing import Dict, List, Any, Optional
+import time
+import statistics
+from functools import cache, lru_cache, partial
+from pprint import pformat
+from typing import Dict, List, Any, Optional, Tuple
 from loguru import logger
 
-# Configure logger
+import orjson
+import ormsgpack
+import zstandard
+
+# Configure logger. Set TEST_LOG_LEVEL=INFO (e.g. in CI) to drop the per-response
+# DEBUG records before any of their payloads are formatted.
+LOG_LEVEL = os.getenv("TEST_LOG_LEVEL", "DEBUG")
 logger.remove()
-logger.add(sys.stderr, level="DEBUG")  # Set to DEBUG for more detailed logs
-logger.add("test_basic_flow.log", rotation="10 MB", level="DEBUG")
+# Sinks write from a background thread so logging never blocks the event loop
+logger.add(sys.stderr, level=LOG_LEVEL, enqueue=True)
+# Rotation checks the file size on every record, so CI runs write without it
+logger.add("test_basic_flow.log", rotation=None if os.getenv("CI") else "10 MB", level=LOG_LEVEL, enqueue=True)
+
+# Structured payloads attached with logger.bind are written to a binary msgpack log next to
+# this script; main opens it for the duration of the run
+_MSGPACK_LOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_basic_flow.mpk")
+
+def _msgpack_sink(log_file, message) -> None:
+    """Append a record's message and bound payload to the msgpack log."""
+    record = message.record
+    log_file.write(ormsgpack.packb(
+        {
+            "time": record["time"].isoformat(),
+            "level": record["level"].name,
+            "message": record["message"],
+            "extra": record["extra"]
+        },
+        default=str
+    ))
 
 # Import the necessary modules
 try:
@@ -19,33 +46,103 @@ try:
         process_response,
         export_session_data
     )
+    from domains.recruitment.scenario_manager import get_scenario_by_id
 except ImportError as e:
-    logger.error(f"Failed to import required modules: {str(e)}")
-    logger.error(f"Traceback: {traceback.format_exc()}")
+    logger.opt(exception=True).error(f"Failed to import required modules: {str(e)}")
     sys.exit(1)
 
 logger.info("Starting Basic Flow Test Script")
 
-# Test responses
-NORMAL_RESPONSES = [
-    "I would design a microservices architecture for the e-commerce backend. The key microservices would include Product Service, Order Service, User Service, Payment Service, and Inventory Service. Each service would have its own database and communicate via REST APIs or message queues. This approach allows for better scalability, fault isolation, and independent deployment of services.",
-    "For the RESTful API endpoints, I would implement the following:\n\n1. Product Management:\n- GET /products - List all products\n- GET /products/{id} - Get product details\n- POST /products - Create a new product\n- PUT /products/{id} - Update a product\n- DELETE /products/{id} - Delete a product\n\n2. User Orders:\n- GET /orders - List user orders\n- GET /orders/{id} - Get order details\n- POST /orders - Create a new order\n- PUT /orders/{id} - Update order status\n- GET /users/{id}/orders - Get orders for a specific user",
-    "For the database schema, I would use a combination of relational and NoSQL databases:\n\n1. Products Table:\n- product_id (PK)\n- name\n- description\n- price\n- category_id (FK)\n- inventory_count\n- created_at\n- updated_at\n\n2. Customers Table:\n- customer_id (PK)\n- name\n- email\n- password_hash\n- address\n- phone\n- created_at\n\n3. Orders Table:\n- order_id (PK)\n- customer_id (FK)\n- status\n- total_amount\n- shipping_address\n- payment_method\n- created_at\n\n4. OrderItems Table:\n- item_id (PK)\n- order_id (FK)\n- product_id (FK)\n- quantity\n- price_at_purchase",
-    "For user authentication and authorization, I would implement:\n\n1. JWT-based authentication system\n2. OAuth 2.0 for third-party authentication\n3. Role-based access control (RBAC) for authorization\n4. HTTPS for all communications\n5. Password hashing using bcrypt\n6. Rate limiting to prevent brute force attacks\n7. Regular security audits and penetration testing",
-    "To integrate a payment gateway like Stripe, I would:\n\n1. Create a separate Payment Service microservice\n2. Implement Stripe's API for payment processing\n3. Use webhooks to handle asynchronous events (payment success, failure)\n4. Store payment tokens rather than actual card data\n5. Implement idempotency keys to prevent duplicate charges\n6. Add proper error handling and retry mechanisms\n7. Include comprehensive logging for audit trails",
-    "To ensure the platform can scale to handle high traffic, I would implement:\n\n1. Horizontal scaling of microservices using Kubernetes\n2. Database sharding for large tables\n3. Caching layers using Redis for frequently accessed data\n4. CDN for static assets\n5. Asynchronous processing using message queues\n6. Database read replicas to distribute query load\n7. Auto-scaling based on traffic patterns\n8. Load balancing across multiple regions",
-    "For inventory management and preventing overselling, I would implement:\n\n1. Real-time inventory tracking system\n2. Optimistic locking for inventory updates\n3. Temporary inventory holds during checkout process\n4. Scheduled inventory reconciliation jobs\n5. Notifications for low stock items\n6. Integration with warehouse management systems\n7. Fallback mechanisms for handling edge cases"
-]
+def _lazy_pformat(obj: Any):
+    """Defer pretty-printing obj until a sink actually accepts the debug record."""
+    return lambda: pformat(obj, width=120, depth=6)
+
+# Test responses are stored compressed next to this script and loaded on first use
+_FIXTURES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_basic_flow_fixtures.json.zst")
+
+@cache
+def _fixtures() -> Dict[str, Any]:
+    """Decompress and parse the test fixtures file once."""
+    with open(_FIXTURES_PATH, "rb") as f:
+        return orjson.loads(zstandard.ZstdDecompressor().decompress(f.read()))
+
+@cache
+def normal_responses() -> Tuple[str, ...]:
+    """The candidate responses sent in order during the test."""
+    return tuple(_fixtures()["normal_responses"])
+
+@lru_cache(maxsize=32)
+def _scenario(scenario_id: str) -> Optional[Dict[str, Any]]:
+    """Look up a scenario once per ID for the lifetime of the test process."""
+    return get_scenario_by_id(scenario_id)
+
+@cache
+def _clarifications() -> Tuple[str, ...]:
+    """Follow-up answers sent when the system asks for clarification."""
+    return tuple("Let me clarify my previous answer. " + response for response in normal_responses())
+
+@cache
+def _previews() -> Tuple[str, ...]:
+    """First 100 characters of each response, shown in the debug log."""
+    return tuple(response[:100] for response in normal_responses())
+
+async def _timed_process_response(session_id: str, response: str, timings: List[int]) -> Dict[str, Any]:
+    """Process a response, recording how long it took in nanoseconds."""
+    start = time.perf_counter_ns()
+    try:
+        return await process_response(session_id, response)
+    finally:
+        timings.append(time.perf_counter_ns() - start)
+
+def _log_latencies(timings: List[int]) -> None:
+    """Log one summary line for the recorded process_response latencies."""
+    if len(timings) < 2:
+        logger.info("process_response latency ns: {}", timings)
+        return
+    percentiles = statistics.quantiles(timings, n=20)
+    logger.info(
+        "process_response latency ns over {} calls: min={} p50={} p95={}",
+        len(timings), min(timings), statistics.median(timings), percentiles[18]
+    )
+
+async def _finish_and_export(session_id: str) -> bool:
+    """
+    Export a completed session's data. Export problems are logged but do not fail the test.
+    
+    Args:
+        session_id: The completed session's ID
+        
+    Returns:
+        True, since the interview itself completed.
+    """
+    try:
+        export_result = await asyncio.to_thread(export_session_data, session_id)
+        logger.opt(lazy=True).debug("Export result: {}", _lazy_pformat(export_result))
+        
+        if "error" in export_result:
+            logger.error(f"Error exporting session data: {export_result['error']}")
+        else:
+            logger.info(f"Exported session data to: {export_result.get('export_path')}")
+    except Exception as e:
+        logger.opt(exception=True).error(f"Exception during export_session_data: {str(e)}")
+    
+    return True
 
 async def test_basic_flow():
     """Test the basic happy path flow of the HR automation tool."""
     logger.info("Testing basic flow")
+    # Latencies are collected in memory and reported once, not per response
+    timings: List[int] = []
+    responses = normal_responses()
+    response_count = len(responses)
+    clarifications = _clarifications()
+    previews = _previews()
     
     try:
         # Start an interview session
         logger.info("Starting interview session...")
         session_info = await start_interview_session()
-        logger.debug(f"Session info: {json.dumps(session_info, default=str, indent=2)}")
+        logger.bind(session=session_info).debug("Session ready: {}", session_info.get("session_id"))
         
         # Log scenario details
         if "scenario" in session_info:
@@ -53,13 +150,12 @@ async def test_basic_flow():
             logger.info(f"Using scenario: {scenario.get('id')} - {scenario.get('title')}")
             
             # Get the scenario details to check number of questions
-            from domains.recruitment.scenario_manager import get_scenario_by_id
-            full_scenario = get_scenario_by_id(scenario.get('id'))
+            full_scenario = _scenario(scenario.get('id'))
             if full_scenario and "questions" in full_scenario:
                 questions = full_scenario["questions"]
                 logger.info(f"Scenario has {len(questions)} questions")
-                logger.debug(f"Questions: {json.dumps([q['id'] for q in questions], indent=2)}")
-                logger.info(f"We are providing {len(NORMAL_RESPONSES)} responses")
+                logger.opt(lazy=True).debug("Question ids: {}", lambda: [q['id'] for q in questions])
+                logger.info("We are providing {} responses", response_count)
             else:
                 logger.warning("Could not get full scenario details")
         
@@ -72,83 +168,69 @@ async def test_basic_flow():
         
         logger.info(f"Started interview session with ID: {session_id}")
         
-        # Process responses
-        for i, response in enumerate(NORMAL_RESPONSES):
-            logger.info(f"Processing response {i+1}/{len(NORMAL_RESPONSES)}")
-            logger.debug(f"Response content: {response[:100]}...")
+        # Process responses. The next response is submitted as soon as the current one
+        # is known not to need clarification, so its processing overlaps our logging.
+        next_task = None
+        for i, response in enumerate(responses):
+            logger.info("Processing response {}/{}", i + 1, response_count)
+            logger.debug("Response content: {}...", previews[i])
             
             try:
-                result = await process_response(session_id, response)
-                logger.debug(f"Process response result: {json.dumps(result, default=str, indent=2)}")
+                task = next_task or asyncio.create_task(_timed_process_response(session_id, response, timings))
+                next_task = None
+                result = await task
+                logger.opt(lazy=True).debug("Process response result: {}", _lazy_pformat(result))
             except Exception as e:
-                logger.error(f"Exception during process_response: {str(e)}")
-                logger.error(f"Traceback: {traceback.format_exc()}")
+                logger.opt(exception=True).error(f"Exception during process_response: {str(e)}")
                 return False
             
-            if "error" in result:
-                logger.error(f"Error processing response {i+1}: {result['error']}")
+            status = result.get("status")
+            error = result.get("error")
+            awaiting_clarification = result.get("awaiting_clarification", False)
+            
+            if error is not None:
+                logger.error("Error processing response {}: {}", i + 1, error)
                 return False
             
             # Check if interview is complete
-            if result.get("status") == "completed":
+            if status == "completed":
                 logger.info("Interview completed successfully")
                 
-                # Export the session data
-                try:
-                    export_result = export_session_data(session_id)
-                    logger.debug(f"Export result: {json.dumps(export_result, default=str, indent=2)}")
-                    
-                    if "error" in export_result:
-                        logger.error(f"Error exporting session data: {export_result['error']}")
-                    else:
-                        logger.info(f"Exported session data to: {export_result.get('export_path')}")
-                except Exception as e:
-                    logger.error(f"Exception during export_session_data: {str(e)}")
-                    logger.error(f"Traceback: {traceback.format_exc()}")
-                
-                return True
+                return await _finish_and_export(session_id)
             
-            logger.info(f"Interview not yet complete after response {i+1}")
-            logger.debug(f"Current state: awaiting_clarification={result.get('awaiting_clarification', False)}")
+            if not awaiting_clarification and i + 1 < response_count:
+                next_task = asyncio.create_task(_timed_process_response(session_id, responses[i + 1], timings))
+            
+            logger.info("Interview not yet complete after response {}", i + 1)
+            logger.debug("Current state: awaiting_clarification={}", awaiting_clarification)
             
             # Check if we're waiting for clarification
-            if result.get("awaiting_clarification"):
+            if awaiting_clarification:
                 logger.info("System is awaiting clarification, providing additional response")
-                clarification_response = "Let me clarify my previous answer. " + response
+                clarification_response = clarifications[i]
                 logger.info("Sending clarification response")
                 
                 try:
-                    clarification_result = await process_response(session_id, clarification_response)
-                    logger.debug(f"Clarification result: {json.dumps(clarification_result, default=str, indent=2)}")
+                    clarification_result = await _timed_process_response(session_id, clarification_response, timings)
+                    logger.opt(lazy=True).debug("Clarification result: {}", _lazy_pformat(clarification_result))
+                    
+                    clarification_status = clarification_result.get("status")
+                    clarification_error = clarification_result.get("error")
                     
-                    if "error" in clarification_result:
-                        logger.error(f"Error processing clarification response: {clarification_result['error']}")
+                    if clarification_error is not None:
+                        logger.error(f"Error processing clarification response: {clarification_error}")
                         return False
                     
                     # Check if interview is complete after clarification
-                    if clarification_result.get("status") == "completed":
+                    if clarification_status == "completed":
                         logger.info("Interview completed successfully after clarification")
                         
-                        # Export the session data
-                        try:
-                            export_result = export_session_data(session_id)
-                            logger.debug(f"Export result: {json.dumps(export_result, default=str, indent=2)}")
-                            
-                            if "error" in export_result:
-                                logger.error(f"Error exporting session data: {export_result['error']}")
-                            else:
-                                logger.info(f"Exported session data to: {export_result.get('export_path')}")
-                        except Exception as e:
-                            logger.error(f"Exception during export_session_data: {str(e)}")
-                            logger.error(f"Traceback: {traceback.format_exc()}")
-                        
-                        return True
+                        return await _finish_and_export(session_id)
                     
                     # Update result to the clarification result for the next iteration
                     result = clarification_result
                 except Exception as e:
-                    logger.error(f"Exception during clarification process_response: {str(e)}")
-                    logger.error(f"Traceback: {traceback.format_exc()}")
+                    logger.opt(exception=True).error(f"Exception during clarification process_response: {str(e)}")
                     return False
         
         # If we get here, the interview wasn't completed with the provided responses
@@ -157,23 +239,66 @@ async def test_basic_flow():
         return False
     
     except Exception as e:
-        logger.error(f"Error in test_basic_flow: {str(e)}")
-        logger.error(f"Traceback: {traceback.format_exc()}")
+        logger.opt(exception=True).error(f"Error in test_basic_flow: {str(e)}")
         return False
+    finally:
+        _log_latencies(timings)
+
+async def test_basic_flow_matrix(concurrency: int = 4, sessions: int = 8) -> bool:
+    """
+    Run several independent basic flow sessions at once.
+    
+    Each session's responses stay sequential, but the LLM calls of different sessions overlap.
+    
+    Args:
+        concurrency: Maximum number of sessions running at the same time
+        sessions: Number of sessions to run
+        
+    Returns:
+        True if every session completed successfully.
+    """
+    logger.info(f"Testing basic flow with {sessions} sessions, {concurrency} at a time")
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def bounded_session() -> bool:
+        async with semaphore:
+            return await test_basic_flow()
+    
+    results = await asyncio.gather(*(bounded_session() for _ in range(sessions)))
+    logger.info(f"{sum(results)}/{sessions} sessions completed successfully")
+    return all(results)
 
 async def main():
     """Run the basic flow test and report results."""
     logger.info("Starting HR Automation Basic Flow Test")
     
-    # Run the basic flow test
-    result = await test_basic_flow()
-    
-    # Report result
-    if result:
-        logger.info("Basic Flow Test: PASSED")
-    else:
-        logger.error("Basic Flow Test: FAILED")
-    
+    with open(_MSGPACK_LOG_PATH, "ab") as msgpack_log:
+        sink_id = logger.add(
+            partial(_msgpack_sink, msgpack_log),
+            level=LOG_LEVEL,
+            filter=lambda record: bool(record["extra"]),
+            enqueue=True
+        )
+        try:
+            # Run a single session, or a concurrent matrix of sessions when TEST_SESSIONS > 1
+            sessions = int(os.getenv("TEST_SESSIONS", "1"))
+            if sessions > 1:
+                result = await test_basic_flow_matrix(
+                    concurrency=int(os.getenv("TEST_CONCURRENCY", "4")),
+                    sessions=sessions
+                )
+            else:
+                result = await test_basic_flow()
+            
+            # Report result
+            if result:
+                logger.info("Basic Flow Test: PASSED")
+            else:
+                logger.error("Basic Flow Test: FAILED")
+        finally:
+            # Flush the enqueued log records before the msgpack log is closed
+            await logger.complete()
+            logger.remove(sink_id)
     return result
 
 if __name__ == "__main__":
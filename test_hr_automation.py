@@ -4,261 +4,136 @@ import json
 import os
 import sys
 import time
-from typing import Dict, List, Any, Optional
+from functools import cache
+from typing import Dict, List, Any, Optional, Sequence, Tuple
 from loguru import logger
 
 # Configure logger
 logger.remove()
-logger.add(sys.stderr, level="INFO")
-logger.add("test_hr_automation.log", rotation="10 MB", level="DEBUG")
+# Sinks write from a background thread so logging never blocks the event loop
+logger.add(sys.stderr, level="INFO", enqueue=True)
+logger.add("test_hr_automation.log", rotation="10 MB", level="DEBUG", enqueue=True)
+# The end-of-run summary record is also written as JSON for tooling
+logger.add(
+    "test_hr_automation.jsonl",
+    level="INFO",
+    filter=lambda record: "summary" in record["extra"],
+    enqueue=True,
+    serialize=True
+)
 
 # Import the necessary modules
 try:
     from domains.handler import (
         start_interview_session,
         process_response,
+        process_current_response,
+        SESSION_CV,
         get_session_info,
         export_session_data,
         run_single_interview
     )
+    from domains.recruitment.conversation import _append_to_history, _get_recent_history
     from domains.recruitment.scenario_manager import get_all_scenarios, get_scenario_by_id
+    from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 except ImportError as e:
     logger.error(f"Failed to import required modules: {e}")
     sys.exit(1)
 
 logger.info("Starting HR Automation Test Script")
 
-# Test scenarios
-NORMAL_RESPONSES = [
-    "I would design a microservices architecture for the e-commerce backend. The key microservices would include Product Service, Order Service, User Service, Payment Service, and Inventory Service. Each service would have its own database and communicate via REST APIs or message queues. This approach allows for better scalability, fault isolation, and independent deployment of services.",
-    "For the RESTful API endpoints, I would implement the following:\n\n1. Product Management:\n- GET /products - List all products\n- GET /products/{id} - Get product details\n- POST /products - Create a new product\n- PUT /products/{id} - Update a product\n- DELETE /products/{id} - Delete a product\n\n2. User Orders:\n- GET /orders - List user orders\n- GET /orders/{id} - Get order details\n- POST /orders - Create a new order\n- PUT /orders/{id} - Update order status\n- GET /users/{id}/orders - Get orders for a specific user",
-    "For the database schema, I would use a combination of relational and NoSQL databases:\n\n1. Products Table:\n- product_id (PK)\n- name\n- description\n- price\n- category_id (FK)\n- inventory_count\n- created_at\n- updated_at\n\n2. Customers Table:\n- customer_id (PK)\n- name\n- email\n- password_hash\n- address\n- phone\n- created_at\n\n3. Orders Table:\n- order_id (PK)\n- customer_id (FK)\n- status\n- total_amount\n- shipping_address\n- payment_method\n- created_at\n\n4. OrderItems Table:\n- item_id (PK)\n- order_id (FK)\n- product_id (FK)\n- quantity\n- price_at_purchase",
-    "For user authentication and authorization, I would implement:\n\n1. JWT-based authentication system\n2. OAuth 2.0 for third-party authentication\n3. Role-based access control (RBAC) for authorization\n4. HTTPS for all communications\n5. Password hashing using bcrypt\n6. Rate limiting to prevent brute force attacks\n7. Regular security audits and penetration testing",
-    "To integrate a payment gateway like Stripe, I would:\n\n1. Create a separate Payment Service microservice\n2. Implement Stripe's API for payment processing\n3. Use webhooks to handle asynchronous events (payment success, failure)\n4. Store payment tokens rather than actual card data\n5. Implement idempotency keys to prevent duplicate charges\n6. Add proper error handling and retry mechanisms\n7. Include comprehensive logging for audit trails",
-    "To ensure the platform can scale to handle high traffic, I would implement:\n\n1. Horizontal scaling of microservices using Kubernetes\n2. Database sharding for large tables\n3. Caching layers using Redis for frequently accessed data\n4. CDN for static assets\n5. Asynchronous processing using message queues\n6. Database read replicas to distribute query load\n7. Auto-scaling based on traffic patterns\n8. Load balancing across multiple regions",
-    "For inventory management and preventing overselling, I would implement:\n\n1. Real-time inventory tracking system\n2. Optimistic locking for inventory updates\n3. Temporary inventory holds during checkout process\n4. Scheduled inventory reconciliation jobs\n5. Notifications for low stock items\n6. Integration with warehouse management systems\n7. Fallback mechanisms for handling edge cases"
-]
+# Scenario list shared by main and any test that needs scenario metadata
+_cached_scenarios = cache(get_all_scenarios)
 
-SHORT_RESPONSES = [
-    "Microservices architecture.",
-    "REST APIs for products and orders.",
-    "Relational DB for products, customers, orders.",
-    "JWT auth and HTTPS.",
-    "Stripe API integration.",
-    "K8s, caching, CDN.",
-    "Real-time inventory tracking."
-]
+# Test responses live in fixtures/responses.json and are loaded on first use
+_FIXTURES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "responses.json")
 
-LONG_RESPONSE = """
-I would design a comprehensive microservices architecture for the e-commerce backend that prioritizes scalability, resilience, and maintainability. The architecture would consist of the following key microservices:
-
-1. Product Service: Manages product catalog, categories, attributes, and search functionality.
-2. Order Service: Handles order creation, processing, and management.
-3. User Service: Manages user accounts, profiles, and authentication.
-4. Payment Service: Integrates with payment gateways and handles payment processing.
-5. Inventory Service: Tracks product inventory and prevents overselling.
-6. Notification Service: Handles emails, SMS, and push notifications.
-7. Analytics Service: Collects and processes business metrics and user behavior.
-8. Recommendation Service: Provides personalized product recommendations.
-9. Review Service: Manages product reviews and ratings.
-10. Cart Service: Handles shopping cart functionality.
-
-Each service would have its own dedicated database, chosen based on the specific requirements of that service. For instance, the Product Service might use Elasticsearch for efficient searching, while the Order Service would use a relational database for ACID compliance.
-
-These services would communicate primarily through asynchronous messaging using a message broker like RabbitMQ or Kafka, with synchronous REST APIs used where immediate responses are required. This approach allows for better scalability, fault isolation, and independent deployment of services.
-
-For service discovery and configuration management, I would implement a service mesh architecture using tools like Istio or Linkerd, combined with Kubernetes for container orchestration. This would provide features like load balancing, circuit breaking, and observability out of the box.
-
-The entire system would be deployed in a cloud environment (AWS, GCP, or Azure) using infrastructure as code (Terraform or CloudFormation) and would leverage managed services where appropriate to reduce operational overhead.
-
-For monitoring and observability, I would implement a comprehensive solution using tools like Prometheus, Grafana, and Jaeger for distributed tracing. This would allow for quick identification and resolution of issues in production.
-
-The architecture would also include CI/CD pipelines for each service, enabling rapid and reliable deployments with automated testing at each stage.
-
-This architecture provides a solid foundation for an e-commerce platform that can scale to handle high traffic and evolve over time as business requirements change.
-"""
-
-CODE_RESPONSE = """
-For implementing the RESTful API endpoints, I would use a framework like Express.js for Node.js or Spring Boot for Java. Here's a sample implementation in Express.js:
-
-```javascript
-const express = require('express');
-const router = express.Router();
-const ProductController = require('../controllers/ProductController');
-const OrderController = require('../controllers/OrderController');
-const authMiddleware = require('../middleware/auth');
-
-// Product endpoints
-router.get('/products', ProductController.getAllProducts);
-router.get('/products/:id', ProductController.getProductById);
-router.post('/products', authMiddleware.isAdmin, ProductController.createProduct);
-router.put('/products/:id', authMiddleware.isAdmin, ProductController.updateProduct);
-router.delete('/products/:id', authMiddleware.isAdmin, ProductController.deleteProduct);
-
-// Order endpoints
-router.get('/orders', authMiddleware.isAuthenticated, OrderController.getUserOrders);
-router.get('/orders/:id', authMiddleware.isAuthenticated, OrderController.getOrderById);
-router.post('/orders', authMiddleware.isAuthenticated, OrderController.createOrder);
-router.put('/orders/:id', authMiddleware.isAdmin, OrderController.updateOrderStatus);
-router.get('/users/:id/orders', authMiddleware.isAdminOrSelf, OrderController.getUserOrders);
-
-module.exports = router;
-```
-
-For the database schema, I would use an ORM like Sequelize or Hibernate. Here's a sample Sequelize model for the Product entity:
-
-```javascript
-const { DataTypes } = require('sequelize');
-const sequelize = require('../config/database');
-
-const Product = sequelize.define('Product', {
-  product_id: {
-    type: DataTypes.UUID,
-    defaultValue: DataTypes.UUIDV4,
-    primaryKey: true
-  },
-  name: {
-    type: DataTypes.STRING,
-    allowNull: false
-  },
-  description: {
-    type: DataTypes.TEXT,
-    allowNull: true
-  },
-  price: {
-    type: DataTypes.DECIMAL(10, 2),
-    allowNull: false
-  },
-  category_id: {
-    type: DataTypes.UUID,
-    allowNull: false,
-    references: {
-      model: 'Categories',
-      key: 'category_id'
-    }
-  },
-  inventory_count: {
-    type: DataTypes.INTEGER,
-    allowNull: false,
-    defaultValue: 0
-  },
-  created_at: {
-    type: DataTypes.DATE,
-    defaultValue: DataTypes.NOW
-  },
-  updated_at: {
-    type: DataTypes.DATE,
-    defaultValue: DataTypes.NOW
-  }
-});
-
-module.exports = Product;
-```
-
-For handling inventory and preventing overselling, I would implement a transaction-based approach:
-
-```javascript
-async function processOrder(orderData) {
-  const transaction = await sequelize.transaction();
-  
-  try {
-    // Check inventory for all products
-    for (const item of orderData.items) {
-      const product = await Product.findByPk(item.product_id, { transaction });
-      
-      if (!product) {
-        throw new Error(`Product ${item.product_id} not found`);
-      }
-      
-      if (product.inventory_count < item.quantity) {
-        throw new Error(`Insufficient inventory for product ${product.name}`);
-      }
-      
-      // Update inventory
-      await product.update({
-        inventory_count: product.inventory_count - item.quantity
-      }, { transaction });
-    }
-    
-    // Create order
-    const order = await Order.create({
-      customer_id: orderData.customer_id,
-      status: 'pending',
-      total_amount: orderData.total_amount,
-      shipping_address: orderData.shipping_address,
-      payment_method: orderData.payment_method
-    }, { transaction });
+@cache
+def _responses() -> Dict[str, Any]:
+    """Load the candidate response fixtures once.
     
-    // Create order items
-    for (const item of orderData.items) {
-      await OrderItem.create({
-        order_id: order.order_id,
-        product_id: item.product_id,
-        quantity: item.quantity,
-        price_at_purchase: item.price
-      }, { transaction });
-    }
-    
-    // Commit transaction
-    await transaction.commit();
-    return order;
-  } catch (error) {
-    // Rollback transaction on error
-    await transaction.rollback();
-    throw error;
-  }
-}
-```
-
-This implementation ensures that inventory is properly managed and prevents overselling through the use of database transactions.
-"""
+    Returns:
+        Dict with the "normal" and "short" response lists and the single
+        "long", "code", "foreign" and "special" responses
+    """
+    with open(_FIXTURES_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+@cache
+def _normal_tail() -> Tuple[str, ...]:
+    """The normal responses after the first, shared by the edge cases that swap in their own opener."""
+    return tuple(_responses()["normal"][1:])
 
-FOREIGN_LANGUAGE_RESPONSE = """
-Pour l'architecture backend de l'e-commerce, je proposerais une architecture de microservices. Les principaux microservices seraient le Service de Produits, le Service de Commandes, le Service Utilisateur, le Service de Paiement et le Service d'Inventaire. Chaque service aurait sa propre base de données et communiquerait via des API REST ou des files d'attente de messages. Cette approche permet une meilleure évolutivité, une isolation des défaillances et un déploiement indépendant des services.
-
-Pour les points de terminaison de l'API RESTful, j'implémentarais:
-1. Gestion des produits:
-   - GET /produits - Liste de tous les produits
-   - GET /produits/{id} - Détails du produit
-   - POST /produits - Créer un nouveau produit
-   - PUT /produits/{id} - Mettre à jour un produit
-   - DELETE /produits/{id} - Supprimer un produit
-
-2. Commandes utilisateur:
-   - GET /commandes - Liste des commandes
-   - GET /commandes/{id} - Détails de la commande
-   - POST /commandes - Créer une nouvelle commande
-   - PUT /commandes/{id} - Mettre à jour l'état de la commande
-   - GET /utilisateurs/{id}/commandes - Obtenir les commandes d'un utilisateur spécifique
-"""
+EMPTY_RESPONSE = ""
 
-SPECIAL_CHARS_RESPONSE = """
-I would design the architecture with these components:
-* Product Service (manages product catalog)
-* Order Service (handles orders & processing)
-* User Service (manages accounts & auth)
-* Payment Service (handles payments)
-* Inventory Service (tracks stock)
+# Seconds an error test may take before it counts as failed
+ERROR_TEST_TIMEOUT = 0.5
 
-For the database schema, I'd use:
-- Products: product_id (PK), name, description, price, category_id (FK), inventory_count
-- Customers: customer_id (PK), name, email, password_hash, address
-- Orders: order_id (PK), customer_id (FK), status, total_amount, shipping_address
-- OrderItems: item_id (PK), order_id (FK), product_id (FK), quantity, price_at_purchase
+# Seconds a single process_response call may take before the interview counts as failed
+RESPONSE_TIMEOUT = 30
 
-For security, I'd implement:
-1️⃣ JWT authentication
-2️⃣ HTTPS encryption
-3️⃣ Password hashing with bcrypt
-4️⃣ Rate limiting
-5️⃣ Input validation & sanitization
+# Interview sessions started ahead of the edge cases, one per case; each case consumes its session
+EDGE_CASE_SESSIONS = 6
+_session_pool: asyncio.Queue[str] = asyncio.Queue()
 
-To prevent SQL injection: Always use parameterized queries like `SELECT * FROM products WHERE id = ?` instead of string concatenation.
+async def _fill_session_pool(size: int) -> None:
+    """Start size interview sessions concurrently and add them to the pool."""
+    for session_info in await asyncio.gather(*(start_interview_session() for _ in range(size))):
+        if "session_id" in session_info:
+            _session_pool.put_nowait(session_info["session_id"])
 
-For XSS prevention: Escape all user input with functions like `htmlspecialchars()` in PHP or use frameworks that automatically escape output.
-"""
+async def _acquire_session() -> Optional[str]:
+    """Take a pooled session, starting a new one when the pool is empty."""
+    try:
+        return _session_pool.get_nowait()
+    except asyncio.QueueEmpty:
+        session_info = await start_interview_session()
+        return session_info.get("session_id")
 
-EMPTY_RESPONSE = ""
+async def _drive_interview(session_id: str, responses: Sequence[str], name: str) -> bool:
+    """
+    Send responses to an interview session until the interview completes.
+    
+    Args:
+        session_id: The session to drive
+        responses: The candidate responses, sent in order
+        name: Label for the interview in log messages
+        
+    Returns:
+        True if the interview completed, False on an error, a timeout or running out of responses.
+    """
+    # Callers each run in their own task or await this directly, so the session set here stays private
+    token = SESSION_CV.set(session_id)
+    try:
+        for i, response in enumerate(responses):
+            logger.info(f"Processing response {i+1}/{len(responses)} for {name}")
+            logger.opt(lazy=True).debug("Response content: {}...", lambda: response[:50])
+            
+            try:
+                async with asyncio.timeout(RESPONSE_TIMEOUT):
+                    result = await process_current_response(response)
+            except TimeoutError:
+                logger.error(f"Response {i+1} for {name} timed out after {RESPONSE_TIMEOUT}s")
+                return False
+            logger.opt(lazy=True).debug("Process response result: {}", lambda: repr(result))
+            
+            if "error" in result:
+                logger.error(f"Error processing response {i+1} for {name}: {result['error']}")
+                return False
+            
+            # Check if interview is complete
+            if result.get("status") == "completed":
+                logger.info(f"Interview completed successfully for {name}")
+                return True
+            
+            logger.info(f"Interview not yet complete after response {i+1} for {name}")
+        
+        # If we get here, the interview wasn't completed with the provided responses
+        logger.warning(f"Interview not completed with provided responses for {name}")
+        logger.warning("This could be because the interview requires more responses than provided")
+        return False
+    finally:
+        SESSION_CV.reset(token)
 
 async def test_basic_flow():
     """Test the basic happy path flow of the HR automation tool."""
@@ -268,7 +143,7 @@ async def test_basic_flow():
         # Start an interview session
         logger.info("Starting interview session...")
         session_info = await start_interview_session()
-        logger.debug(f"Session info: {session_info}")
+        logger.opt(lazy=True).debug("Session info: {}", lambda: session_info)
         session_id = session_info.get("session_id")
         
         if not session_id:
@@ -279,36 +154,17 @@ async def test_basic_flow():
         logger.info(f"Started interview session with ID: {session_id}")
         
         # Process responses
-        for i, response in enumerate(NORMAL_RESPONSES):
-            logger.info(f"Processing response {i+1}/{len(NORMAL_RESPONSES)}")
-            logger.debug(f"Response content: {response[:50]}...")
-            
-            result = await process_response(session_id, response)
-            logger.debug(f"Process response result: {result}")
-            
-            if "error" in result:
-                logger.error(f"Error processing response {i+1}: {result['error']}")
-                return False
-            
-            # Check if interview is complete
-            if result.get("status") == "completed":
-                logger.info("Interview completed successfully")
-                
-                # Export the session data
-                export_result = export_session_data(session_id)
-                if "error" in export_result:
-                    logger.error(f"Error exporting session data: {export_result['error']}")
-                else:
-                    logger.info(f"Exported session data to: {export_result.get('export_path')}")
-                
-                return True
-            
-            logger.info(f"Interview not yet complete after response {i+1}")
+        if not await _drive_interview(session_id, _responses()["normal"], "basic flow"):
+            return False
         
-        # If we get here, the interview wasn't completed with the provided responses
-        logger.warning("Interview not completed with provided responses")
-        logger.warning("This could be because the interview requires more responses than provided")
-        return False
+        # Export the session data off the event loop thread
+        export_result = await asyncio.to_thread(export_session_data, session_id)
+        if "error" in export_result:
+            logger.error(f"Error exporting session data: {export_result['error']}")
+        else:
+            logger.info(f"Exported session data to: {export_result.get('export_path')}")
+        
+        return True
     
     except Exception as e:
         logger.error(f"Error in test_basic_flow: {str(e)}")
@@ -320,54 +176,41 @@ async def test_edge_cases():
     """Test various edge cases."""
     logger.info("Testing edge cases")
     
+    responses = _responses()
     edge_cases = [
-        {"name": "Short responses", "responses": SHORT_RESPONSES},
-        {"name": "Long response", "responses": [LONG_RESPONSE] + NORMAL_RESPONSES[1:]},
-        {"name": "Code response", "responses": [CODE_RESPONSE] + NORMAL_RESPONSES[1:]},
-        {"name": "Foreign language", "responses": [FOREIGN_LANGUAGE_RESPONSE] + NORMAL_RESPONSES[1:]},
-        {"name": "Special characters", "responses": [SPECIAL_CHARS_RESPONSE] + NORMAL_RESPONSES[1:]},
-        {"name": "Empty response", "responses": [EMPTY_RESPONSE] + NORMAL_RESPONSES}
+        {"name": "Short responses", "responses": responses["short"]},
+        {"name": "Long response", "responses": (responses["long"], *_normal_tail())},
+        {"name": "Code response", "responses": (responses["code"], *_normal_tail())},
+        {"name": "Foreign language", "responses": (responses["foreign"], *_normal_tail())},
+        {"name": "Special characters", "responses": (responses["special"], *_normal_tail())},
+        {"name": "Empty response", "responses": (EMPTY_RESPONSE, *responses["normal"])}
     ]
     
-    results = {}
-    
-    for case in edge_cases:
+    async def run_case(case: Dict[str, Any]) -> Tuple[str, bool]:
+        """Run one edge case in its own interview session."""
         logger.info(f"Testing edge case: {case['name']}")
         
         try:
-            # Start an interview session
-            session_info = await start_interview_session()
-            session_id = session_info.get("session_id")
+            # Get an interview session
+            session_id = await _acquire_session()
             
             if not session_id:
                 logger.error(f"Failed to get session_id for edge case: {case['name']}")
-                results[case['name']] = False
-                continue
+                return case['name'], False
             
             # Process responses
-            for i, response in enumerate(case['responses']):
-                logger.info(f"Processing response {i+1}/{len(case['responses'])}")
-                result = await process_response(session_id, response)
-                
-                if "error" in result:
-                    logger.error(f"Error processing response {i+1} for {case['name']}: {result['error']}")
-                    results[case['name']] = False
-                    break
-                
-                # Check if interview is complete
-                if result.get("status") == "completed":
-                    logger.info(f"Interview completed successfully for edge case: {case['name']}")
-                    results[case['name']] = True
-                    break
-            
-            # If we get here and haven't set a result, the interview wasn't completed
-            if case['name'] not in results:
-                logger.warning(f"Interview not completed for edge case: {case['name']}")
-                results[case['name']] = False
+            return case['name'], await _drive_interview(session_id, case['responses'], f"edge case: {case['name']}")
         
         except Exception as e:
             logger.error(f"Error in edge case {case['name']}: {str(e)}")
-            results[case['name']] = False
+            return case['name'], False
+    
+    # The cases use independent sessions, so run them concurrently
+    outcomes = await asyncio.gather(*(run_case(case) for case in edge_cases), return_exceptions=True)
+    results = {
+        case['name']: False if isinstance(outcome, BaseException) else outcome[1]
+        for case, outcome in zip(edge_cases, outcomes)
+    }
     
     logger.info(f"Edge case results: {results}")
     return results
@@ -376,10 +219,23 @@ async def test_error_handling():
     """Test error handling and recovery."""
     logger.info("Testing error handling")
     
+    # get_session_info is synchronous, so it runs in a thread to give every test an awaitable
     error_tests = [
-        {"name": "Invalid session ID", "test": lambda: process_response("invalid_session_id", NORMAL_RESPONSES[0])},
-        {"name": "Invalid scenario ID", "test": lambda: start_interview_session("invalid_scenario_id")},
-        {"name": "Get info for non-existent session", "test": lambda: get_session_info("non_existent_session")}
+        {
+            "name": "Invalid session ID",
+            "test": lambda: process_response("invalid_session_id", _responses()["normal"][0]),
+            "expected_error_substring": "Session invalid_session_id not found"
+        },
+        {
+            "name": "Invalid scenario ID",
+            "test": lambda: start_interview_session("invalid_scenario_id"),
+            "expected_error_substring": "Scenario with ID invalid_scenario_id not found"
+        },
+        {
+            "name": "Get info for non-existent session",
+            "test": lambda: asyncio.to_thread(get_session_info, "non_existent_session"),
+            "expected_error_substring": "Session non_existent_session not found"
+        }
     ]
     
     results = {}
@@ -388,16 +244,23 @@ async def test_error_handling():
         logger.info(f"Running error test: {test['name']}")
         
         try:
-            result = await test["test"]()
+            # Invalid IDs should be rejected straight away, so bound each call tightly
+            result = await asyncio.wait_for(test["test"](), timeout=ERROR_TEST_TIMEOUT)
             
-            # Check if the result contains an error
-            if "error" in result:
-                logger.info(f"Error test {test['name']} passed: {result['error']}")
-                results[test['name']] = True
-            else:
+            # Check if the result contains the expected error
+            if "error" not in result:
                 logger.warning(f"Error test {test['name']} failed: No error returned")
                 results[test['name']] = False
+            elif test["expected_error_substring"] not in result["error"]:
+                logger.warning(f"Error test {test['name']} failed: Unexpected error: {result['error']}")
+                results[test['name']] = False
+            else:
+                logger.info(f"Error test {test['name']} passed: {result['error']}")
+                results[test['name']] = True
         
+        except TimeoutError:
+            logger.error(f"Error test {test['name']} timed out after {ERROR_TEST_TIMEOUT}s")
+            results[test['name']] = False
         except Exception as e:
             logger.error(f"Unexpected exception in error test {test['name']}: {str(e)}")
             results[test['name']] = False
@@ -409,24 +272,33 @@ async def test_concurrent_interviews():
     """Test handling of concurrent interviews."""
     logger.info("Testing concurrent interviews")
     
-    # Create tasks for multiple concurrent interviews
-    tasks = []
-    for i in range(3):  # Run 3 concurrent interviews
-        logger.info(f"Setting up concurrent interview {i+1}")
-        tasks.append(run_single_interview(None, NORMAL_RESPONSES))
+    # Run each interview eagerly up to its first real suspension (Python 3.12+)
+    loop = asyncio.get_running_loop()
+    previous_factory = loop.get_task_factory()
+    eager_task_factory = getattr(asyncio, "eager_task_factory", None)
     
-    # Run interviews concurrently
     try:
-        results = await asyncio.gather(*tasks)
-        
-        # Check results
-        success_count = 0
-        for i, result in enumerate(results):
-            if "error" not in result:
-                logger.info(f"Concurrent interview {i+1} completed successfully")
-                success_count += 1
-            else:
-                logger.error(f"Concurrent interview {i+1} failed: {result['error']}")
+        async with asyncio.TaskGroup() as tg:
+            # Create tasks for multiple concurrent interviews
+            tasks = []
+            if eager_task_factory is not None:
+                loop.set_task_factory(eager_task_factory)
+            try:
+                for i in range(3):  # Run 3 concurrent interviews
+                    logger.info(f"Setting up concurrent interview {i+1}")
+                    tasks.append(tg.create_task(run_single_interview(None, _responses()["normal"])))
+            finally:
+                loop.set_task_factory(previous_factory)
+            
+            # Check each interview as soon as it finishes rather than after the slowest one
+            success_count = 0
+            for finished, next_result in enumerate(asyncio.as_completed(tasks), start=1):
+                result = await next_result
+                if "error" not in result:
+                    logger.info(f"Concurrent interview {finished}/{len(tasks)} completed successfully")
+                    success_count += 1
+                else:
+                    logger.error(f"Concurrent interview {finished}/{len(tasks)} failed: {result['error']}")
         
         logger.info(f"Concurrent interviews: {success_count}/{len(tasks)} successful")
         return success_count == len(tasks)
@@ -435,51 +307,104 @@ async def test_concurrent_interviews():
         logger.error(f"Error in concurrent interviews test: {str(e)}")
         return False
 
+def test_history_rebuilt_session():
+    """Test that appending to a session rebuilt from storage adds each message to the transcript once."""
+    logger.info("Testing conversation history of a rebuilt session")
+    
+    # Built the way handler.process_response rebuilds sessions: no cached transcript lines
+    session = {
+        "conversation_history": [
+            SystemMessage(content="You are an HR interviewer conducting a technical assessment interview."),
+            AIMessage(content="Q1?")
+        ]
+    }
+    _append_to_history(session, HumanMessage(content="A1"))
+    
+    lines = list(_get_recent_history(session))
+    expected = ["Interviewer: Q1?", "Candidate: A1"]
+    if lines != expected:
+        logger.error(f"Rebuilt session history is {lines}, expected {expected}")
+        return False
+    
+    logger.info("Rebuilt session history test passed")
+    return True
+
 async def main():
     """Run all tests and report results."""
     logger.info("Starting HR Automation tests")
     
     # Check if scenarios are available
-    scenarios = get_all_scenarios()
+    scenarios = _cached_scenarios()
     if not scenarios:
         logger.error("No scenarios available. Tests cannot proceed.")
         return
     
-    logger.info(f"Found {len(scenarios)} scenarios")
+    # Warm up model clients and scenario loading so the tests measure steady-state behaviour
+    try:
+        warm = await start_interview_session()
+        if "session_id" in warm:
+            await process_response(warm["session_id"], "warmup")
+    except Exception as e:
+        logger.warning(f"Warm-up failed: {str(e)}")
+    
+    # Start the edge case sessions up front instead of inside each case
+    await _fill_session_pool(EDGE_CASE_SESSIONS)
     
     # Run tests
     test_results = {
         "basic_flow": await test_basic_flow(),
         "edge_cases": await test_edge_cases(),
         "error_handling": await test_error_handling(),
-        "concurrent_interviews": await test_concurrent_interviews()
+        "concurrent_interviews": await test_concurrent_interviews(),
+        "history_rebuilt_session": test_history_rebuilt_session()
     }
     
-    # Report results
-    logger.info("Test Results:")
-    logger.info(f"Basic Flow: {'PASSED' if test_results['basic_flow'] else 'FAILED'}")
-    
     edge_case_results = test_results['edge_cases']
     edge_cases_passed = sum(1 for result in edge_case_results.values() if result)
-    logger.info(f"Edge Cases: {edge_cases_passed}/{len(edge_case_results)} passed")
-    
     error_handling_results = test_results['error_handling']
     error_tests_passed = sum(1 for result in error_handling_results.values() if result)
-    logger.info(f"Error Handling: {error_tests_passed}/{len(error_handling_results)} passed")
-    
-    logger.info(f"Concurrent Interviews: {'PASSED' if test_results['concurrent_interviews'] else 'FAILED'}")
     
     # Overall result
-    all_passed = (
+    all_passed = bool(
         test_results['basic_flow'] and
         edge_cases_passed == len(edge_case_results) and
         error_tests_passed == len(error_handling_results) and
-        test_results['concurrent_interviews']
+        test_results['concurrent_interviews'] and
+        test_results['history_rebuilt_session']
     )
     
-    logger.info(f"Overall Test Result: {'PASSED' if all_passed else 'FAILED'}")
+    # Report results in a single structured record
+    summary = {
+        "scenarios": len(scenarios),
+        "basic_flow": test_results['basic_flow'],
+        "edge_cases_passed": edge_cases_passed,
+        "edge_cases_total": len(edge_case_results),
+        "error_tests_passed": error_tests_passed,
+        "error_tests_total": len(error_handling_results),
+        "concurrent_interviews": test_results['concurrent_interviews'],
+        "history_rebuilt_session": test_results['history_rebuilt_session'],
+        "passed": all_passed
+    }
+    logger.bind(summary=summary).info(
+        f"Test results: Basic Flow {'PASSED' if summary['basic_flow'] else 'FAILED'}, "
+        f"Edge Cases {edge_cases_passed}/{len(edge_case_results)} passed, "
+        f"Error Handling {error_tests_passed}/{len(error_handling_results)} passed, "
+        f"Concurrent Interviews {'PASSED' if summary['concurrent_interviews'] else 'FAILED'}, "
+        f"Rebuilt Session History {'PASSED' if summary['history_rebuilt_session'] else 'FAILED'}, "
+        f"Overall {'PASSED' if all_passed else 'FAILED'}"
+    )
     
+    # Flush the enqueued log records before exiting
+    await logger.complete()
     return test_results
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    # Run on uvloop when it is available (it is not on Windows)
+    try:
+        import uvloop
+        loop_factory = uvloop.new_event_loop
+    except ImportError:
+        logger.info("uvloop not installed, using the default asyncio event loop")
+        loop_factory = None
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        runner.run(main())
\ No newline at end of file